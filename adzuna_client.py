@@ -0,0 +1,208 @@
+# adzuna_client.py - Async, pooled client for the Adzuna job search API
+#
+# Fetch several countries, pages and search terms at once:
+#   jobs = fetch_jobs_concurrently(app_id, app_key, ["Data Scientist", "DevOps Engineer"], ["gb", "in"], pages=2)
+# Point base_url at a local stub server to exercise it without the real API.
+import asyncio
+import random
+
+import aiohttp
+
+from rate_limit import BudgetError
+
+ADZUNA_BASE_URL = "https://api.adzuna.com/v1/api/jobs"
+
+# Convert common location names to country codes
+COUNTRY_CODES = {
+    "united states": "us",
+    "usa": "us",
+    "uk": "gb",
+    "united kingdom": "gb",
+    "australia": "au",
+    "canada": "ca",
+    "germany": "de",
+    "india": "in",
+    "remote": "gb"  # Default to GB for remote
+}
+
+# Responses worth retrying - rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class AdzunaError(Exception):
+    """Raised when the Adzuna API keeps failing after all retries"""
+
+def country_code_for(location):
+    """Map a location name (or country code) to an Adzuna country code"""
+    location = location.lower()
+    if location in COUNTRY_CODES.values():
+        return location
+    return COUNTRY_CODES.get(location, "in")
+
+# Convert one Adzuna API result into the job dictionary used throughout the app
+def format_adzuna_job(result):
+    """Format a raw Adzuna search result as a job dictionary"""
+    # Format salary if available
+    salary_info = result.get("salary_is_predicted", "0")
+    salary_text = "Not specified"
+    if salary_info == "0" and "salary_min" in result and "salary_max" in result:
+        min_salary = result.get("salary_min", 0)
+        max_salary = result.get("salary_max", 0)
+        if min_salary and max_salary:
+            salary_text = f"{min_salary:,.0f} - {max_salary:,.0f} {result.get('salary_currency', '')}/year"
+
+    return {
+        "title": result.get("title", "No title"),
+        "company": result.get("company", {}).get("display_name", "No company"),
+        "location": result.get("location", {}).get("display_name", "No location"),
+        "salary": salary_text,
+        "link": result.get("redirect_url", "#"),
+        "description": result.get("description", "No description available"),
+        "source": "Adzuna",
+        "id": result.get("id"),
+        "date_posted": result.get("created", "")
+    }
+
+def merge_jobs(job_lists):
+    """Concatenate job lists, keeping the first listing seen for each link"""
+    seen_links = set()
+    merged = []
+    for jobs in job_lists:
+        for job in jobs:
+            link = job.get("link")
+            if link and link != "#":
+                if link in seen_links:
+                    continue
+                seen_links.add(link)
+            merged.append(job)
+    return merged
+
+class AdzunaClient:
+    """
+    Async Adzuna client sharing one pooled HTTP session
+
+    Use as an async context manager. Every request has a timeout, at most
+    max_concurrency requests are in flight at once, and 429/5xx responses,
+    connection errors and timeouts are retried with exponential backoff.
+    With a rate_limit.RequestBudget every HTTP attempt must first take a
+    token from it (waiting at most acquire_timeout seconds, or indefinitely
+    with None, and leaving budget_reserve daily calls untouched), and
+    identical requests already in flight are shared instead of being sent
+    again.
+    """
+
+    def __init__(self, app_id, app_key, base_url=ADZUNA_BASE_URL, timeout=10.0,
+                 max_concurrency=4, max_retries=3, backoff=0.5, budget=None,
+                 acquire_timeout=30.0, budget_reserve=0):
+        self.app_id = app_id
+        self.app_key = app_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.budget = budget
+        self.acquire_timeout = acquire_timeout
+        self.budget_reserve = budget_reserve
+        self.session = None
+        self._semaphore = None
+        self._in_flight = {}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+        self.session = None
+
+    def _retry_delay(self, attempt, retry_after=None):
+        if retry_after:
+            try:
+                return min(float(retry_after), 60.0)
+            except ValueError:
+                pass
+        # Full jitter keeps concurrent retries from hitting the API in lockstep
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    async def get_page(self, what, country="gb", page=1, results_per_page=10, **params):
+        """Fetch one raw search-results page as a dict"""
+        url = f"{self.base_url}/{country}/search/{page}"
+        query = {
+            "app_id": self.app_id,
+            "app_key": self.app_key,
+            "results_per_page": results_per_page,
+            "what": what,
+            "content-type": "application/json",
+            **params
+        }
+        # Callers asking for a page that is already being fetched share that request
+        key = (url, tuple(sorted((k, str(v)) for k, v in query.items())))
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_page(url, query))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_page(self, url, query):
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            if self.budget is not None:
+                try:
+                    await asyncio.to_thread(self.budget.acquire, self.acquire_timeout, self.budget_reserve)
+                except BudgetError as e:
+                    raise AdzunaError(str(e)) from e
+            async with self._semaphore:
+                try:
+                    async with self.session.get(url, params=query) as response:
+                        if response.status == 200:
+                            return await response.json(content_type=None)
+                        last_error = AdzunaError(f"Adzuna API error: {response.status}")
+                        if response.status not in RETRY_STATUSES:
+                            raise last_error
+                        retry_after = response.headers.get("Retry-After")
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    last_error = AdzunaError(f"Adzuna request failed: {e}")
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._retry_delay(attempt, retry_after))
+        raise last_error
+
+    async def search(self, what, country="gb", page=1, results_per_page=10, **params):
+        """Fetch one page of results formatted as job dictionaries"""
+        data = await self.get_page(what, country, page, results_per_page, **params)
+        return [format_adzuna_job(result) for result in data.get("results", [])]
+
+    async def search_many(self, search_terms, countries, pages=1, results_per_page=10, **params):
+        """
+        Fetch every (search term, country, page) combination concurrently
+
+        Returns:
+            Merged job list with duplicate links removed. Failed requests are
+            skipped; if every request fails the last error is raised.
+        """
+        combinations = [
+            (what, country, page)
+            for what in search_terms
+            for country in countries
+            for page in range(1, pages + 1)
+        ]
+        results = await asyncio.gather(
+            *(self.search(what, country, page, results_per_page, **params) for what, country, page in combinations),
+            return_exceptions=True
+        )
+        job_lists = [result for result in results if not isinstance(result, BaseException)]
+        if results and not job_lists:
+            raise results[-1]
+        return merge_jobs(job_lists)
+
+def fetch_jobs_concurrently(app_id, app_key, search_terms, countries, pages=1, results_per_page=10, **client_kwargs):
+    """Blocking wrapper around AdzunaClient.search_many for non-async callers"""
+    async def run():
+        async with AdzunaClient(app_id, app_key, **client_kwargs) as client:
+            return await client.search_many(search_terms, countries, pages, results_per_page)
+    return asyncio.run(run())
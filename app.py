@@ -1,27 +1,43 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
 import os
-import re
-import tempfile
-import fitz  # PyMuPDF
-import shutil
 from sklearn.feature_extraction.text import TfidfVectorizer
-from scipy import sparse
+from pdf_extract import DEFAULT_MAX_PAGES
+from resume_cache import ResumeCache, hash_pdf_bytes
+from job_index import JobIndex
+# Inference lives in the UI-free screening module; this file only wraps it for Streamlit
+import screening
+from screening import extract_resume_text, load_model_registry, make_classification_batcher
+from model_registry import ModelRegistry
 # Add this near the top with your other imports
 import os
 try:
-    from jobsearch import get_job_recommendations, score_job_relevance
+    from jobsearch import (
+        find_jobs, get_adzuna_credentials, get_dummy_jobs, get_job_cache, get_request_budget,
+        get_job_recommendations, score_job_relevance, score_jobs_relevance
+    )
 except ImportError:
     st.error("jobsearch.py file missing. Please create it to enable job recommendations.")
     
     # Create simple dummy implementations if the file is missing
-    def get_job_recommendations(job_category, location="remote", num_listings=5):
+    def find_jobs(job_category, location="remote", num_listings=5, app_id="", app_key=""):
+        return [], {}
+    
+    def get_adzuna_credentials(secrets=None):
+        return "", ""
+    
+    def get_dummy_jobs(job_title, num_listings=5):
+        return []
+    
+    def get_job_recommendations(job_category, location="remote", num_listings=5, app_id=None, app_key=None):
         return []
         
-    def score_job_relevance(resume_text, job_listing):
+    def score_job_relevance(resume_text, job_listing, resume_tokens=None):
         return 0.5
+    
+    def score_jobs_relevance(resume_text, job_listings, resume_tokens=None, mode="ratio"):
+        return np.full(len(job_listings), 0.5)
 
 # Set page configuration
 st.set_page_config(
@@ -30,269 +46,122 @@ st.set_page_config(
     layout="wide"
 )
 
-# Fix for Windows file handling
-def extract_text_from_pdf(pdf_file):
-    """Extract text with better Windows file handling"""
-    # Create temp file with a unique name
-    temp_dir = tempfile.mkdtemp()
-    temp_path = os.path.join(temp_dir, "resume.pdf")
-    
+# PDF extraction settings - raise workers to split long PDFs across processes
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", DEFAULT_MAX_PAGES))
+PDF_EXTRACT_WORKERS = int(os.environ.get("PDF_EXTRACT_WORKERS", "1"))
+
+# Extract text straight from the uploaded buffer - no temp files
+def extract_text_from_pdf(pdf_file, max_pages=PDF_MAX_PAGES, workers=PDF_EXTRACT_WORKERS):
+    """Extract text from an uploaded PDF by opening its in-memory buffer"""
     try:
-        # Save uploaded file to the temp location
-        with open(temp_path, "wb") as f:
-            f.write(pdf_file.getbuffer())
-        
-        # Extract text
-        doc = fitz.open(temp_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
-        return text
+        return extract_resume_text(pdf_file.getbuffer(), max_pages=max_pages, workers=workers)
     except Exception as e:
         st.error(f"Error processing PDF: {e}")
         return ""
-    finally:
-        # Clean up - make sure to close file handles first
-        try:
-            os.remove(temp_path)
-        except:
-            pass
-        try:
-            shutil.rmtree(temp_dir)
-        except:
-            pass
 
-# Function to detect model feature count
-def get_model_feature_count(model):
-    """Detect the number of features a model expects"""
-    if hasattr(model, 'n_features_in_'):
-        return model.n_features_in_
-    elif hasattr(model, 'coef_') and hasattr(model.coef_, 'shape'):
-        return model.coef_.shape[1]
-    elif hasattr(model, 'feature_importances_') and hasattr(model.feature_importances_, 'shape'):
-        return model.feature_importances_.shape[0]
-    else:
-        return None
+# One resume cache per server process, optionally backed by a directory on disk
+@st.cache_resource
+def get_resume_cache():
+    """Return the shared cache of extracted text and classification results"""
+    return ResumeCache(
+        max_entries=int(os.environ.get("RESUME_CACHE_SIZE", "256")),
+        cache_dir=os.environ.get("RESUME_CACHE_DIR") or None
+    )
 
-# Cache the model loading
+# Cache the model registry - models themselves are unpickled on first use
 @st.cache_resource
 def load_models(models_dir):
-    """Load all models and artifacts with auto feature detection"""
+    """Scan the models directory and return a lazily loading model registry"""
     try:
-        models = {}
-        auto_model_info = {}
-        
-        # Verify models directory exists
-        if not os.path.exists(models_dir):
-            st.error(f"Models directory not found: {models_dir}")
-            return {}, []
-        
-        # Load label encoder
-        encoder_path = os.path.join(models_dir, 'label_encoder.pkl')
-        if not os.path.exists(encoder_path):
-            st.error(f"Label encoder not found at: {encoder_path}")
-            return {}, []
-            
-        with open(encoder_path, 'rb') as f:
-            models['label_encoder'] = pickle.load(f)
-        
-        # Load available classification models
-        model_files = [
-            f for f in os.listdir(models_dir) 
-            if f.endswith('.pkl') and 
-            not f.startswith('tfidf_') and 
-            not f.startswith('bow_') and 
-            not f.startswith('count_') and
-            not f.startswith('label_encoder') and
-            not 'vectorizer' in f.lower()
-        ]
-        
-        for model_file in model_files:
-            with open(os.path.join(models_dir, model_file), 'rb') as f:
-                models[model_file] = pickle.load(f)
+        registry = load_model_registry(models_dir, max_loaded=int(os.environ.get("MODEL_CACHE_SIZE", "4")))
         
-        # Load vectorizers
-        vectorizer_files = [
-            f for f in os.listdir(models_dir)
-            if 'vectorizer' in f.lower() and f.endswith('.pkl')
-        ]
-        
-        for vec_file in vectorizer_files:
-            with open(os.path.join(models_dir, vec_file), 'rb') as f:
-                models[vec_file] = pickle.load(f)
-        
-        # Auto-detect feature dimensions
-        for model_name in [m for m in models.keys() if m.endswith('.pkl') and not 'vectorizer' in m.lower() and not 'label_encoder' in m.lower()]:
-            if 'pipeline' in model_name.lower():
-                # Mark this as a pipeline that takes raw text
-                auto_model_info[model_name] = {'is_pipeline': True}
-            else:
-                feature_count = get_model_feature_count(models[model_name])
-                if feature_count:
-                    auto_model_info[model_name] = {
-                        'vectorizer': 'tfidf_vectorizer.pkl', 
-                        'features': feature_count,
-                        'is_pipeline': False
-                    }
-        
-        return models, model_files, auto_model_info
+        # Feature dimensions are auto-detected into model_info as each model loads
+        return registry, registry.model_files, registry.model_info
+    except FileNotFoundError as e:
+        st.error(str(e))
+        return {}, [], {}
     except Exception as e:
         st.error(f"Error loading models: {str(e)}")
         return {}, [], {}
 
-# Clean text
-def clean_text(text):
-    if not isinstance(text, str):
-        return ""
-    text = text.lower()
-    text = re.sub(r'[^\w\s]', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+# Optional local job index (see job_index.py) searched instead of the live job API
+JOB_INDEX_PATH = os.environ.get("JOB_INDEX_PATH", "")
 
-# Adjust feature dimensions if needed
-def adjust_feature_dimensions(features, expected_features):
-    if expected_features is None:
-        return features
-        
-    current_features = features.shape[1]
-    
-    if current_features == expected_features:
-        return features
-    
-    if current_features > expected_features:
-        return features[:, :expected_features]
+@st.cache_resource
+def load_job_index(index_path):
+    """Load a prebuilt job index once per server process"""
+    return JobIndex.load(index_path)
+
+# How long fetched and scored job listings are reused within the app
+JOB_STAGE_TTL = int(os.environ.get("JOB_STAGE_TTL", "600"))
+
+# Streamlit secrets first, then the environment
+def get_job_api_credentials():
+    """Return the Adzuna (app_id, app_key) configured for the app"""
+    try:
+        secrets = {key: st.secrets[key] for key in ("ADZUNA_APP_ID", "ADZUNA_API_KEY") if key in st.secrets}
+    except Exception:
+        # No secrets.toml
+        secrets = {}
+    return get_adzuna_credentials(secrets)
+
+@st.cache_data(ttl=JOB_STAGE_TTL, show_spinner=False)
+def get_job_listings(category, location, num_jobs):
+    """Fetch job listings for a category, cached per (category, location, count)
+
+    Returns:
+        (jobs, skipped) where skipped lists the job sources that failed
+    """
+    try:
+        jobs, report = find_jobs(category, location, num_jobs, *get_job_api_credentials())
+    except Exception as e:
+        return get_dummy_jobs(category, num_jobs), [f"all sources: {e}"]
+    skipped = [f"{name}: {status}" for name, status in report.items() if not status.startswith(("ok", "unused"))]
+    return jobs, skipped
+
+@st.cache_data(ttl=JOB_STAGE_TTL, show_spinner=False)
+def get_scored_jobs(pdf_hash, _resume_text, category, location, num_jobs):
+    """Fetch job listings for a classified resume and sort them by relevance
+
+    The resume text is left out of the cache key (leading underscore); the
+    PDF hash identifies it.
+
+    Returns:
+        (scored_jobs, skipped): (job, relevance) pairs, most relevant first,
+        and the job sources that failed
+    """
+    skipped = []
+    if JOB_INDEX_PATH and os.path.exists(JOB_INDEX_PATH):
+        job_index = load_job_index(JOB_INDEX_PATH)
+        job_listings = [job for job, _ in job_index.search(_resume_text, k=num_jobs)]
     else:
-        padding = sparse.csr_matrix((features.shape[0], expected_features - current_features))
-        return sparse.hstack([features, padding])
+        job_listings, skipped = get_job_listings(category, location, num_jobs)
+    if not job_listings:
+        return [], skipped
+    
+    # Score every listing in one vectorized pass
+    relevances = score_jobs_relevance(_resume_text, job_listings)
+    scored_jobs = [(job, float(relevance)) for job, relevance in zip(job_listings, relevances)]
+    scored_jobs.sort(key=lambda x: x[1], reverse=True)
+    return scored_jobs, skipped
 
-# MODEL-VECTORIZER MAPPING - FALLBACK IF AUTO-DETECTION FAILS
-MODEL_INFO = {
-    'naive_bayes_model.pkl': {'vectorizer': 'tfidf_vectorizer.pkl', 'features': 3000, 'is_pipeline': False},
-    'linear_svm_model.pkl': {'vectorizer': 'tfidf_vectorizer.pkl', 'features': 661, 'is_pipeline': False},
-    'ensemble_model.pkl': {'vectorizer': 'tfidf_vectorizer.pkl', 'features': 661, 'is_pipeline': False},
-    'ensemble_pipeline.pkl': {'is_pipeline': True},  # Mark as a pipeline that takes raw text
-    'realistic_naive_bayes.pkl': {'vectorizer': 'bow_vectorizer.pkl', 'features': None, 'is_pipeline': False}
-}
+# Sessions classifying at the same time share batched predict_proba calls
+@st.cache_resource(hash_funcs={ModelRegistry: id})
+def get_classification_batcher(loaded_models):
+    """Return the micro-batcher serving a model registry, shared by every session"""
+    return make_classification_batcher(
+        loaded_models,
+        max_batch_size=int(os.environ.get("BATCH_MAX_SIZE", "32")),
+        max_wait_ms=float(os.environ.get("BATCH_MAX_WAIT_MS", "5"))
+    )
 
 # Function to classify resume
 def classify_resume(resume_text, model, model_name, loaded_models, model_info):
+    """Classify one resume, reporting failures in the UI instead of raising"""
     try:
-        # Create category mapping
-        label_encoder = loaded_models['label_encoder']
-        categories = label_encoder.classes_
-        category_names = {i: cat for i, cat in enumerate(categories)}
-        
-        # Check if this is a pipeline model
-        is_pipeline = False
-        
-        # First check auto-detected info
-        if model_name in model_info:
-            model_specs = model_info[model_name]
-            is_pipeline = model_specs.get('is_pipeline', False)
-        # Fall back to predefined
-        elif model_name in MODEL_INFO:
-            is_pipeline = MODEL_INFO[model_name].get('is_pipeline', False)
-        # Default to not a pipeline
-        else:
-            is_pipeline = False
-            
-        # Special check for names containing "pipeline"
-        if 'pipeline' in model_name.lower():
-            is_pipeline = True
-            
-        # Log for debugging
-        st.sidebar.write(f"Model: {model_name}")
-        st.sidebar.write(f"Is pipeline: {is_pipeline}")
-        
-        if is_pipeline:
-            # PIPELINE MODE: Pass raw text directly to the model
-            try:
-                # Try with raw text first
-                prediction = model.predict([resume_text])[0]
-            except:
-                # If that fails, try with cleaned text
-                cleaned_text = clean_text(resume_text)
-                prediction = model.predict([cleaned_text])[0]
-                
-            # Get predicted category
-            if isinstance(prediction, str):
-                predicted_category = prediction
-            else:
-                predicted_category = category_names[prediction]
-                
-            # Get probabilities if available
-            if hasattr(model, 'predict_proba'):
-                try:
-                    probabilities = model.predict_proba([resume_text])[0]
-                except:
-                    probabilities = model.predict_proba([clean_text(resume_text)])[0]
-                    
-                top_indices = probabilities.argsort()[-3:][::-1]
-                top_categories = [(category_names[idx], float(probabilities[idx])) for idx in top_indices]
-            else:
-                top_categories = [(predicted_category, 1.0)]
-                
-        else:
-            # STANDARD MODEL MODE: Vectorize text first
-            cleaned_text = clean_text(resume_text)
-            
-            # Get model info - first try auto-detected, then fall back to predefined
-            if model_name in model_info and not model_info[model_name].get('is_pipeline', False):
-                model_specs = model_info[model_name]
-            else:
-                model_specs = MODEL_INFO.get(model_name, {
-                    'vectorizer': 'tfidf_vectorizer.pkl', 
-                    'features': None,
-                    'is_pipeline': False
-                })
-            
-            vectorizer_name = model_specs.get('vectorizer', 'tfidf_vectorizer.pkl')
-            expected_features = model_specs.get('features', None)
-            
-            # Log for debugging
-            st.sidebar.write(f"Using vectorizer: {vectorizer_name}")
-            st.sidebar.write(f"Expected features: {expected_features}")
-            
-            # Get vectorizer
-            vectorizer = loaded_models[vectorizer_name]
-            
-            # Transform text
-            features = vectorizer.transform([cleaned_text])
-            st.sidebar.write(f"Actual features: {features.shape[1]}")
-            
-            # Adjust features if needed
-            if expected_features is not None:
-                features = adjust_feature_dimensions(features, expected_features)
-            
-            # Predict
-            prediction = model.predict(features)[0]
-            predicted_category = category_names[prediction]
-            
-            # Get probabilities or decision scores
-            if hasattr(model, 'predict_proba'):
-                probabilities = model.predict_proba(features)[0]
-                top_indices = probabilities.argsort()[-3:][::-1]
-                top_categories = [(category_names[idx], float(probabilities[idx])) for idx in top_indices]
-            else:
-                # Fall back to decision function if available
-                if hasattr(model, 'decision_function'):
-                    decision_scores = model.decision_function(features)[0]
-                    top_indices = np.argsort(decision_scores)[-3:][::-1]
-                    
-                    # Normalize scores to appear like probabilities
-                    scores = decision_scores[top_indices]
-                    if len(scores) > 0:
-                        max_score = max(abs(score) for score in scores)
-                        normalized_scores = [(score + max_score) / (2 * max_score) for score in scores]
-                        top_categories = [(category_names[idx], float(score)) for idx, score in zip(top_indices, normalized_scores)]
-                    else:
-                        top_categories = [(predicted_category, 1.0)]
-                else:
-                    top_categories = [(predicted_category, 1.0)]
-        
-        return predicted_category, top_categories
-        
+        if isinstance(loaded_models, ModelRegistry):
+            return get_classification_batcher(loaded_models)((resume_text, model_name, 3))
+        return screening.classify_resume(resume_text, model, model_name, loaded_models, model_info, top_k=3)
     except Exception as e:
         st.error(f"Error during classification: {str(e)}")
         return "Classification Error", [("Error", 0.0)]
@@ -315,8 +184,18 @@ def main():
         """)
         
         # Show API status
-        adzuna_configured = bool(st.secrets.get("ADZUNA_APP_ID", os.environ.get("ADZUNA_APP_ID", "")))
+        adzuna_configured = all(get_job_api_credentials())
         st.write(f"- Adzuna API: {'✅ Configured' if adzuna_configured else '❌ Not configured'}")
+        
+        # Shared job cache counters for today
+        try:
+            cache_stats = get_job_cache().stats()
+            st.write(f"- Job cache today: {cache_stats['hits'] + cache_stats['stale_hits']} hits, "
+                     f"{cache_stats['misses']} misses, {cache_stats['api_calls']} API calls")
+            budget_usage = get_request_budget().usage()
+            st.write(f"- API budget: {budget_usage['calls_today']}/{budget_usage['daily_limit']} calls used today")
+        except Exception:
+            pass
     
     # Path to models (change this to your models folder path)
     models_dir = './models'  # IMPORTANT: Update this path to where your models are stored
@@ -377,8 +256,15 @@ def main():
     uploaded_file = st.file_uploader("Upload Resume (PDF format)", type=["pdf"])
     
     if uploaded_file is not None:
-        with st.spinner("Extracting text from PDF..."):
-            resume_text = extract_text_from_pdf(uploaded_file)
+        # Reruns and repeat submissions of the same PDF are served from the cache
+        resume_cache = get_resume_cache()
+        pdf_hash = hash_pdf_bytes(uploaded_file.getbuffer())
+        resume_text = resume_cache.get_text(pdf_hash, PDF_MAX_PAGES)
+        if resume_text is None:
+            with st.spinner("Extracting text from PDF..."):
+                resume_text = extract_text_from_pdf(uploaded_file)
+            if resume_text:
+                resume_cache.put_text(pdf_hash, PDF_MAX_PAGES, resume_text)
         
         if not resume_text:
             st.error("Could not extract text from the PDF. Please try a different file.")
@@ -388,97 +274,107 @@ def main():
         with st.expander("Resume Text Preview"):
             st.text(resume_text[:1000] + "..." if len(resume_text) > 1000 else resume_text)
         
+        # Classification results live in session state so that widget changes
+        # further down (location, number of jobs) don't throw them away
+        classifications = st.session_state.setdefault("classifications", {})
+        model_version = loaded_models.artifact_version(selected_model_name)
+        result_key = (pdf_hash, selected_model_name, model_version)
+        
         # Classify button
         if st.button("Classify Resume"):
-            with st.spinner("Classifying..."):
-                # Fixed function call - pass auto_model_info as the fifth argument
-                predicted_category, top_categories = classify_resume(
-                    resume_text, selected_model, selected_model_name, loaded_models, auto_model_info
-                )
-            
-            # Show results
-            st.success(f"Predicted Job Category: **{predicted_category}**")
-            
-            # Display top categories
-            st.subheader("Top Job Categories:")
-            
-            # Progress bars for top categories
-            for category, prob in top_categories:
-                st.write(f"{category}")
-                st.progress(min(float(prob), 1.0))
-                st.write(f"Confidence: {prob:.2f}")
-            
-            # Recommendations based on category
-            st.subheader("Recommendations:")
-            
-            # Add category-specific advice
-            if predicted_category in ["Data Science", "Machine Learning Engineering"]:
-                st.info("Consider highlighting your experience with Python, machine learning libraries, and data analysis projects.")
-            elif predicted_category in ["Frontend Development", "UI/UX Design"]:
-                st.info("Emphasize your portfolio and experience with modern frameworks like React, Angular, or Vue.")
-            elif predicted_category in ["Backend Development", "Full Stack Development"]:
-                st.info("Make sure to showcase your API development skills and database knowledge.")
-            elif predicted_category in ["Software Development", "Software Engineering"]:
-                st.info("Highlight your programming languages, frameworks, and software development methodologies.")
-            elif predicted_category in ["DevOps Engineering", "Cloud Architecture"]:
-                st.info("Emphasize your experience with cloud platforms, containerization, and automation tools.")
+            cached_result = resume_cache.get_result(pdf_hash, PDF_MAX_PAGES, selected_model_name, model_version)
+            if cached_result is not None:
+                classifications[result_key] = cached_result
             else:
-                st.info("Ensure your resume highlights relevant technical skills and experience for this role.")
-            
-            # Job Recommendations Section - MOVED THIS INSIDE the classification button click
-            if predicted_category != "Classification Error":
-                # Job Recommendations Section
-                st.subheader("🔍 Recommended Jobs Based on Your Resume")
-                
-                # Let user select location
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    location_options = ["Remote", "United States", "India", "United Kingdom", "Canada", "Australia", "Germany"]
-                    selected_location = st.selectbox("Select location for jobs:", location_options)
-                
-                with col2:
-                    num_jobs = st.selectbox("Number of jobs:", [5, 10, 15], index=0)
-                
-                # Get job recommendations
-                with st.spinner("Finding relevant jobs..."):
-                    job_listings = get_job_recommendations(predicted_category, selected_location, num_jobs)
-                
-                # Calculate relevance scores
-                if resume_text and job_listings:
-                    scored_jobs = []
-                    for job in job_listings:
-                        relevance = score_job_relevance(resume_text, job)
-                        scored_jobs.append((job, relevance))
+                with st.spinner("Classifying..."):
+                    # Fixed function call - pass auto_model_info as the fifth argument
+                    predicted_category, top_categories = classify_resume(
+                        resume_text, selected_model, selected_model_name, loaded_models, auto_model_info
+                    )
+                classifications[result_key] = (predicted_category, top_categories)
+                if predicted_category != "Classification Error":
+                    resume_cache.put_result(pdf_hash, PDF_MAX_PAGES, selected_model_name, model_version, (predicted_category, top_categories))
+        
+        if result_key not in classifications:
+            return
+        predicted_category, top_categories = classifications[result_key]
+        
+        # Show results
+        st.success(f"Predicted Job Category: **{predicted_category}**")
+        
+        # Display top categories
+        st.subheader("Top Job Categories:")
+        
+        # Progress bars for top categories
+        for category, prob in top_categories:
+            st.write(f"{category}")
+            st.progress(min(float(prob), 1.0))
+            st.write(f"Confidence: {prob:.2f}")
+        
+        # Recommendations based on category
+        st.subheader("Recommendations:")
+        
+        # Add category-specific advice
+        if predicted_category in ["Data Science", "Machine Learning Engineering"]:
+            st.info("Consider highlighting your experience with Python, machine learning libraries, and data analysis projects.")
+        elif predicted_category in ["Frontend Development", "UI/UX Design"]:
+            st.info("Emphasize your portfolio and experience with modern frameworks like React, Angular, or Vue.")
+        elif predicted_category in ["Backend Development", "Full Stack Development"]:
+            st.info("Make sure to showcase your API development skills and database knowledge.")
+        elif predicted_category in ["Software Development", "Software Engineering"]:
+            st.info("Highlight your programming languages, frameworks, and software development methodologies.")
+        elif predicted_category in ["DevOps Engineering", "Cloud Architecture"]:
+            st.info("Emphasize your experience with cloud platforms, containerization, and automation tools.")
+        else:
+            st.info("Ensure your resume highlights relevant technical skills and experience for this role.")
+        
+        if predicted_category == "Classification Error":
+            return
+        
+        # Job Recommendations Section
+        st.subheader("🔍 Recommended Jobs Based on Your Resume")
+        
+        # Let user select location
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            location_options = ["Remote", "United States", "India", "United Kingdom", "Canada", "Australia", "Germany"]
+            selected_location = st.selectbox("Select location for jobs:", location_options)
+        
+        with col2:
+            num_jobs = st.selectbox("Number of jobs:", [5, 10, 15], index=0)
+        
+        # Get job recommendations and relevance scores (cached per resume, category, location and count)
+        with st.spinner("Finding relevant jobs..."):
+            scored_jobs, skipped_sources = get_scored_jobs(
+                pdf_hash, resume_text, predicted_category, selected_location, num_jobs
+            )
+        if skipped_sources:
+            st.sidebar.warning("Some job sources were skipped - " + "; ".join(skipped_sources))
+        
+        # Display jobs with relevance bars
+        if scored_jobs:
+            st.write(f"Found {len(scored_jobs)} job opportunities matching your profile:")
+            for i, (job, relevance) in enumerate(scored_jobs):
+                with st.expander(f"{i+1}. {job['title']} at {job['company']}"):
+                    col1, col2 = st.columns([3, 1])
+                    
+                    with col1:
+                        st.write(f"**Company:** {job['company']}")
+                        st.write(f"**Location:** {job['location']}")
+                        if job['salary'] != "Not specified":
+                            st.write(f"**Salary:** {job['salary']}")
                     
-                    # Sort by relevance
-                    scored_jobs.sort(key=lambda x: x[1], reverse=True)
+                    with col2:
+                        st.write("**Match Score:**")
+                        st.progress(relevance)
+                        st.write(f"{int(relevance * 100)}% match")
                     
-                    # Display jobs with relevance bars
-                    if scored_jobs:
-                        st.write(f"Found {len(scored_jobs)} job opportunities matching your profile:")
-                        for i, (job, relevance) in enumerate(scored_jobs):
-                            with st.expander(f"{i+1}. {job['title']} at {job['company']}"):
-                                col1, col2 = st.columns([3, 1])
-                                
-                                with col1:
-                                    st.write(f"**Company:** {job['company']}")
-                                    st.write(f"**Location:** {job['location']}")
-                                    if job['salary'] != "Not specified":
-                                        st.write(f"**Salary:** {job['salary']}")
-                                
-                                with col2:
-                                    st.write("**Match Score:**")
-                                    st.progress(relevance)
-                                    st.write(f"{int(relevance * 100)}% match")
-                                
-                                st.write("**Description:**")
-                                st.write(job['description'])
-                                
-                                st.markdown(f"[Apply Now]({job['link']})", unsafe_allow_html=True)
-                    else:
-                        st.info("No job listings found. Try changing the location or try again later.")
-                else:
-                    st.info("Job recommendations could not be retrieved. Please try again.")
+                    st.write("**Description:**")
+                    st.write(job['description'])
+                    
+                    st.markdown(f"[Apply Now]({job['link']})", unsafe_allow_html=True)
+        else:
+            st.info("No job listings found. Try changing the location or try again later.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,112 @@
+# batching.py - Coalesce concurrent single-item calls into batched calls
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class MicroBatcher:
+    """
+    Collect items submitted from any thread and process them in batches
+
+    A dispatcher thread takes the first waiting item, then keeps collecting
+    until max_batch_size items are in hand or max_wait_ms has passed since
+    that first item, and calls batch_fn(items) once. batch_fn must return one
+    result per item, in order. A result that is an exception instance is
+    raised to that caller only; if batch_fn itself raises, every caller in
+    the batch gets the exception.
+
+    The knobs trade latency for throughput: max_wait_ms is the most a lone
+    request is delayed, max_batch_size caps how much work one call does.
+    With max_wait_ms=0 only requests that queued up while the previous batch
+    ran are coalesced.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=32, max_wait_ms=5.0, name="batcher"):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, item):
+        """Queue one item, returning a concurrent.futures.Future for its result"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._dispatch, name=self.name, daemon=True)
+                self._thread.start()
+            self._queue.put((item, future))
+        return future
+
+    def __call__(self, item, timeout=None):
+        """Submit one item and block for its result"""
+        return self.submit(item).result(timeout)
+
+    def close(self):
+        """Finish the queued work and stop the dispatcher thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._queue.put(_STOP)
+        if thread is not None:
+            thread.join()
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                # Put it back so the dispatcher stops after this batch
+                self._queue.put(_STOP)
+                break
+            batch.append(entry)
+        return batch
+
+    def _dispatch(self):
+        while True:
+            entry = self._queue.get()
+            if entry is _STOP:
+                return
+            batch = self._collect(entry)
+            # Callers that gave up (cancelled futures) are dropped before running
+            batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            metrics.increment("batching.batches", batcher=self.name)
+            metrics.increment("batching.items", len(batch), batcher=self.name)
+            try:
+                with metrics.timed("batching.run", batcher=self.name):
+                    results = list(self.batch_fn([item for item, _ in batch]))
+                if len(results) != len(batch):
+                    raise RuntimeError(f"{self.name}: batch_fn returned {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                logger.exception("%s: batch of %d failed", self.name, len(batch))
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
@@ -0,0 +1,188 @@
+# bulk_screen.py - Headless bulk screening of PDF resumes
+#
+# Usage:
+#   python bulk_screen.py resumes/ --output results.csv
+#   python bulk_screen.py intake.zip --output results.jsonl --model linear_svm_model.pkl
+import argparse
+import csv
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from pdf_extract import DEFAULT_MAX_PAGES, extract_pdf_pages
+
+OUTPUT_FIELDS = [
+    "file", "predicted_category", "confidence", "top_categories",
+    "pages", "chars", "extract_seconds", "classify_seconds", "error"
+]
+
+# Collect PDF inputs from a directory, tar or zip archive
+def iter_pdf_sources(input_path):
+    """Yield (name, bytes) for every PDF in a directory, tar or zip archive"""
+    if os.path.isdir(input_path):
+        for root, _, files in os.walk(input_path):
+            for file_name in sorted(files):
+                if file_name.lower().endswith(".pdf"):
+                    path = os.path.join(root, file_name)
+                    with open(path, "rb") as f:
+                        yield os.path.relpath(path, input_path), f.read()
+    elif zipfile.is_zipfile(input_path):
+        with zipfile.ZipFile(input_path) as archive:
+            for member in archive.infolist():
+                if not member.is_dir() and member.filename.lower().endswith(".pdf"):
+                    yield member.filename, archive.read(member)
+    elif tarfile.is_tarfile(input_path):
+        with tarfile.open(input_path) as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(".pdf"):
+                    yield member.name, archive.extractfile(member).read()
+    else:
+        raise ValueError(f"Input must be a directory, zip or tar archive: {input_path}")
+
+# Worker: extract text from one PDF held in memory
+def extract_pdf_bytes(name, data, max_pages=DEFAULT_MAX_PAGES):
+    """Extract text from PDF bytes, returning (name, text, pages, seconds, error)"""
+    start = time.perf_counter()
+    try:
+        # Each file already runs in its own worker, so pages are read serially
+        pages = extract_pdf_pages(data, max_pages=max_pages, workers=1)
+        return name, "".join(pages), len(pages), time.perf_counter() - start, ""
+    except Exception as e:
+        return name, "", 0, time.perf_counter() - start, f"Error processing PDF: {e}"
+
+# Run extraction across a process pool, keeping a bounded number of files in flight
+def extract_all(sources, workers, max_in_flight, max_pages=DEFAULT_MAX_PAGES):
+    """Yield extraction results as workers finish them"""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for name, data in sources:
+            pending.add(pool.submit(extract_pdf_bytes, name, data, max_pages))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+
+class ResultWriter:
+    """Stream result rows to CSV or JSONL, flushing after every batch"""
+
+    def __init__(self, output_path, output_format=None):
+        self.format = output_format or ("jsonl" if output_path.endswith((".jsonl", ".json")) else "csv")
+        self.file = open(output_path, "w", newline="", encoding="utf-8")
+        if self.format == "csv":
+            self.writer = csv.DictWriter(self.file, fieldnames=OUTPUT_FIELDS)
+            self.writer.writeheader()
+
+    def write_rows(self, rows):
+        for row in rows:
+            if self.format == "csv":
+                self.writer.writerow(dict(row, top_categories=json.dumps(row["top_categories"])))
+            else:
+                self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+# Classify one batch of extracted resumes and build output rows
+def classify_batch(batch, model, model_name, loaded_models, model_info, top_k):
+    """Classify extracted resumes and return one output row per file"""
+    # Imported lazily so extraction workers never load scikit-learn
+    from screening import classify_resumes
+
+    rows = []
+    readable = [item for item in batch if item[1]]
+    start = time.perf_counter()
+    results = classify_resumes(
+        [text for _, text, _, _, _ in readable], model, model_name, loaded_models, model_info, top_k=top_k
+    ) if readable else []
+    classify_seconds = (time.perf_counter() - start) / max(len(readable), 1)
+    results_by_name = {item[0]: result for item, result in zip(readable, results)}
+
+    for name, text, pages, extract_seconds, error in batch:
+        row = {
+            "file": name,
+            "predicted_category": "",
+            "confidence": 0.0,
+            "top_categories": [],
+            "pages": pages,
+            "chars": len(text),
+            "extract_seconds": round(extract_seconds, 4),
+            "classify_seconds": 0.0,
+            "error": error or ("" if text else "No text extracted"),
+        }
+        if name in results_by_name:
+            predicted_category, top_categories = results_by_name[name]
+            row.update({
+                "predicted_category": predicted_category,
+                "confidence": top_categories[0][1],
+                "top_categories": top_categories,
+                "classify_seconds": round(classify_seconds, 4),
+            })
+        rows.append(row)
+    return rows
+
+def run(input_path, output_path, model_name, models_dir="./models", workers=None,
+        batch_size=64, top_k=3, output_format=None, max_pages=DEFAULT_MAX_PAGES):
+    """Extract, classify and stream results for every PDF under input_path"""
+    from screening import load_model_registry
+
+    try:
+        loaded_models = load_model_registry(models_dir)
+    except FileNotFoundError as e:
+        raise SystemExit(str(e))
+    model_files, model_info = loaded_models.model_files, loaded_models.model_info
+    if model_name not in model_files:
+        raise SystemExit(f"Model {model_name} not found in {models_dir}. Available: {', '.join(model_files)}")
+    model = loaded_models[model_name]
+
+    workers = workers or os.cpu_count() or 1
+    writer = ResultWriter(output_path, output_format)
+    total, failed = 0, 0
+    start = time.perf_counter()
+    try:
+        batch = []
+        for result in extract_all(iter_pdf_sources(input_path), workers, workers * 4, max_pages):
+            batch.append(result)
+            if len(batch) >= batch_size:
+                rows = classify_batch(batch, model, model_name, loaded_models, model_info, top_k)
+                writer.write_rows(rows)
+                total += len(rows)
+                failed += sum(1 for row in rows if row["error"])
+                batch = []
+        if batch:
+            rows = classify_batch(batch, model, model_name, loaded_models, model_info, top_k)
+            writer.write_rows(rows)
+            total += len(rows)
+            failed += sum(1 for row in rows if row["error"])
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Screened {total} resumes ({failed} failed) in {elapsed:.1f}s -> {output_path}", file=sys.stderr)
+    return total, failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classify a directory, zip or tar archive of PDF resumes")
+    parser.add_argument("input", help="Directory, .zip or .tar(.gz) containing PDF resumes")
+    parser.add_argument("--output", "-o", required=True, help="Output file (.csv or .jsonl)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Override the output format")
+    parser.add_argument("--model", default="ensemble_pipeline.pkl", help="Model file name in the models directory")
+    parser.add_argument("--models-dir", default="./models", help="Directory containing the .pkl models")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Resumes per classification batch")
+    parser.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES, help="Pages to read per PDF")
+    parser.add_argument("--top-k", type=int, default=3, help="Categories to report per resume")
+    args = parser.parse_args(argv)
+
+    run(args.input, args.output, args.model, models_dir=args.models_dir, workers=args.workers,
+        batch_size=args.batch_size, top_k=args.top_k, output_format=args.format,
+        max_pages=args.max_pages)
+
+if __name__ == "__main__":
+    main()
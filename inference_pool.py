@@ -0,0 +1,153 @@
+# inference_pool.py - Classification on forked workers that share the parent's models
+#
+# The parent loads every model once and forks the workers afterwards, so model
+# memory is shared copy-on-write instead of being unpickled per process. The
+# GIL no longer serializes CPU-bound models such as the RandomForest ensemble.
+#
+# Benchmark throughput against worker count:
+#   python inference_pool.py --bench --model ensemble_pipeline.pkl --workers 1 2 4 8
+import argparse
+import gc
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from model_registry import LABEL_ENCODER_FILE
+from screening import classify_requests, load_model_registry
+
+# Set in the parent before forking; every worker inherits it
+_registry = None
+
+def _worker_classify(requests):
+    return classify_requests(requests, _registry)
+
+def _worker_pid(delay):
+    time.sleep(delay)
+    return os.getpid()
+
+class InferencePool:
+    """
+    Pool of forked worker processes classifying with preloaded models
+
+    Construction loads every model (plus the vectorizers and label encoder)
+    into the registry, freezes them out of the garbage collector so worker
+    reference counting doesn't touch and copy their pages, then forks all
+    workers. Needs the "fork" start method, i.e. Linux or macOS.
+    """
+
+    def __init__(self, registry, workers=None, models=None):
+        global _registry
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("InferencePool needs the fork start method, which this platform lacks")
+
+        names = list(models or registry.model_files) + registry.vectorizer_files + [LABEL_ENCODER_FILE]
+        # Keep everything resident so workers never unpickle their own copy
+        registry.max_loaded = max(registry.max_loaded, len(registry))
+        for name in names:
+            registry[name]
+        _registry = registry
+        gc.freeze()
+
+        self.registry = registry
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("fork"))
+        # Fork every worker now, while the parent holds nothing but the models
+        self.pids = sorted(set(self._pool.map(_worker_pid, [0.05] * self.workers)))
+
+    def submit_requests(self, requests):
+        """Classify (text, model_name, top_k) requests on one worker, returning a Future"""
+        return self._pool.submit(_worker_classify, list(requests))
+
+    def classify_requests(self, requests, chunk_size=None):
+        """
+        Classify (text, model_name, top_k) requests split across the workers
+
+        Results come back in request order with the same semantics as
+        screening.classify_requests, so this can be a MicroBatcher batch_fn.
+        """
+        requests = list(requests)
+        if not requests:
+            return []
+        chunk_size = chunk_size or math.ceil(len(requests) / self.workers)
+        futures = [
+            self.submit_requests(requests[start:start + chunk_size])
+            for start in range(0, len(requests), chunk_size)
+        ]
+        return [result for future in futures for result in future.result()]
+
+    def classify(self, texts, model_name, top_k=3):
+        """Classify texts with one model, returning (predicted_category, top_categories) tuples"""
+        return self.classify_requests([(text, model_name, top_k) for text in texts])
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# Random resumes drawn from the TF-IDF vocabulary, so every text hits the model
+def make_benchmark_texts(registry, count, words=250, seed=0):
+    vocabulary = sorted(registry['tfidf_vectorizer.pkl'].vocabulary_)
+    rng = np.random.default_rng(seed)
+    return [" ".join(rng.choice(vocabulary, size=words)) for _ in range(count)]
+
+def benchmark(registry, model_name, worker_counts, requests=2000, batch_size=32, top_k=3):
+    """Print requests/second in-process and for each worker count"""
+    texts = make_benchmark_texts(registry, requests)
+    batches = [
+        [(text, model_name, top_k) for text in texts[start:start + batch_size]]
+        for start in range(0, len(texts), batch_size)
+    ]
+
+    # One batch first so lazy loading doesn't count against the baseline
+    classify_requests(batches[0], registry)
+    start = time.perf_counter()
+    for batch in batches:
+        classify_requests(batch, registry)
+    baseline = requests / (time.perf_counter() - start)
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8}")
+    print(f"{'inline':>8} {baseline:10.1f} {1.0:8.2f}")
+
+    for workers in worker_counts:
+        with InferencePool(registry, workers=workers, models=[model_name]) as pool:
+            # Warm every worker's caches (linear scorers, lazily built state)
+            [future.result() for future in [pool.submit_requests(batches[0]) for _ in range(workers)]]
+            start = time.perf_counter()
+            futures = [pool.submit_requests(batch) for batch in batches]
+            for future in futures:
+                future.result()
+            rate = requests / (time.perf_counter() - start)
+        print(f"{workers:>8} {rate:10.1f} {rate / baseline:8.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classify on forked workers sharing preloaded models")
+    parser.add_argument("--bench", action="store_true", help="Measure requests/second against worker count")
+    parser.add_argument("--models-dir", default="./models")
+    parser.add_argument("--model", default="ensemble_pipeline.pkl")
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="Worker counts to benchmark (default: powers of two up to the CPU count)")
+    parser.add_argument("--requests", type=int, default=2000, help="Benchmark requests per worker count")
+    parser.add_argument("--batch-size", type=int, default=32, help="Requests per dispatched job")
+    args = parser.parse_args(argv)
+
+    if not args.bench:
+        parser.error("nothing to do - pass --bench")
+
+    registry = load_model_registry(args.models_dir)
+    if args.model not in registry.model_files:
+        raise SystemExit(f"Model {args.model} not found in {args.models_dir}. Available: {', '.join(registry.model_files)}")
+    cpus = os.cpu_count() or 1
+    worker_counts = args.workers or [2 ** i for i in range(int(math.log2(cpus)) + 1)]
+    print(f"{args.model}: {args.requests} requests in batches of {args.batch_size} on {cpus} CPUs", file=sys.stderr)
+    benchmark(registry, args.model, worker_counts, requests=args.requests, batch_size=args.batch_size)
+
+if __name__ == "__main__":
+    main()
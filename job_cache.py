@@ -0,0 +1,141 @@
+# job_cache.py - Persistent job-listing cache shared by every worker process
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import date
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "job_cache.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_cache (
+    cache_key TEXT PRIMARY KEY,
+    jobs TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    refresh_until REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS job_cache_counters (
+    day TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, name)
+);
+"""
+
+class JobCache:
+    """
+    SQLite-backed cache of job listings keyed by (search term, country, limit)
+
+    Entries younger than fresh_ttl are served as-is. Entries up to stale_ttl
+    old are served immediately while one background thread - across all
+    processes sharing the database - refreshes them. Anything older, or
+    missing, is fetched before returning. Daily hit/miss/API-call counters
+    are kept in the same database.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, fresh_ttl=3600, stale_ttl=7 * 24 * 3600, refresh_lease=60):
+        self.path = path
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.refresh_lease = refresh_lease
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    @staticmethod
+    def make_key(search_term, country, limit):
+        return json.dumps([search_term.lower(), country.lower(), int(limit)])
+
+    def increment(self, name, amount=1):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO job_cache_counters (day, name, value) VALUES (?, ?, ?) "
+                "ON CONFLICT(day, name) DO UPDATE SET value = value + excluded.value",
+                (date.today().isoformat(), name, amount)
+            )
+
+    def stats(self, day=None):
+        """Return the counters (hits, stale_hits, misses, refreshes, api_calls, errors) for a day"""
+        day = day or date.today().isoformat()
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT name, value FROM job_cache_counters WHERE day = ?", (day,)).fetchall()
+        counters = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "api_calls": 0, "errors": 0}
+        counters.update(dict(rows))
+        return counters
+
+    def get(self, key):
+        """Return (jobs, age_seconds) or (None, None)"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT jobs, fetched_at FROM job_cache WHERE cache_key = ?", (key,)).fetchone()
+        if row is None:
+            return None, None
+        return json.loads(row[0]), time.time() - row[1]
+
+    def put(self, key, jobs):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO job_cache (cache_key, jobs, fetched_at, refresh_until) VALUES (?, ?, ?, 0) "
+                "ON CONFLICT(cache_key) DO UPDATE SET jobs = excluded.jobs, "
+                "fetched_at = excluded.fetched_at, refresh_until = 0",
+                (key, json.dumps(jobs), time.time())
+            )
+
+    def _claim_refresh(self, key):
+        """Take the refresh lease for a key; only one process wins until it expires"""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "UPDATE job_cache SET refresh_until = ? WHERE cache_key = ? AND refresh_until < ?",
+                (now + self.refresh_lease, key, now)
+            )
+            return cursor.rowcount == 1
+
+    def _fetch_and_store(self, key, fetch):
+        self.increment("api_calls")
+        jobs = fetch()
+        self.put(key, jobs)
+        return jobs
+
+    def _refresh(self, key, fetch):
+        try:
+            self._fetch_and_store(key, fetch)
+            self.increment("refreshes")
+        except Exception as e:
+            # Keep serving the stale entry; the lease expires and a later request retries
+            self.increment("errors")
+            logger.warning("Background refresh failed for %s: %s", key, e)
+
+    def get_or_fetch(self, search_term, country, limit, fetch):
+        """
+        Return cached jobs for the key, calling fetch() only when needed
+
+        Args:
+            fetch: Zero-argument callable returning a list of job dicts. It
+                should raise on failure so errors are never cached.
+        """
+        key = self.make_key(search_term, country, limit)
+        jobs, age = self.get(key)
+
+        if jobs is not None and age < self.fresh_ttl:
+            self.increment("hits")
+            return jobs
+
+        if jobs is not None and age < self.stale_ttl:
+            self.increment("stale_hits")
+            if self._claim_refresh(key):
+                threading.Thread(target=self._refresh, args=(key, fetch), daemon=True).start()
+            return jobs
+
+        self.increment("misses")
+        try:
+            return self._fetch_and_store(key, fetch)
+        except Exception:
+            self.increment("errors")
+            raise
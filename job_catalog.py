@@ -0,0 +1,253 @@
+# job_catalog.py - Offline catalog of job listings with incremental Adzuna sync
+#
+# Run from cron (or any scheduler) so recommendations never wait on the network:
+#   python job_catalog.py sync                 # incremental, every category and country
+#   python job_catalog.py sync --full --pages 10
+#   python job_catalog.py stats
+import argparse
+import asyncio
+import logging
+import math
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+
+from adzuna_client import COUNTRY_CODES, AdzunaClient, AdzunaError
+from rate_limit import DailyBudgetExhausted
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = "job_catalog.sqlite3"
+
+# Pairs synced at once; each waits for budget tokens as long as it takes
+DEFAULT_SYNC_WORKERS = 4
+
+# Daily API calls a sync leaves unused for interactive recommendation requests
+DEFAULT_SYNC_RESERVE = int(os.environ.get("JOB_SYNC_RESERVE", "30"))
+
+SUPPORTED_COUNTRIES = sorted(set(COUNTRY_CODES.values()))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    link TEXT PRIMARY KEY,
+    job_id TEXT,
+    category TEXT NOT NULL,
+    country TEXT NOT NULL,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    salary TEXT,
+    description TEXT,
+    source TEXT,
+    date_posted TEXT,
+    ingested_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_category ON jobs (category, country, date_posted DESC);
+CREATE TABLE IF NOT EXISTS sync_state (
+    category TEXT NOT NULL,
+    country TEXT NOT NULL,
+    last_posted TEXT,
+    last_synced REAL,
+    PRIMARY KEY (category, country)
+);
+"""
+
+JOB_COLUMNS = ["title", "company", "location", "salary", "link", "description", "source", "date_posted"]
+
+def _parse_date(value):
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+
+class JobCatalog:
+    """Local SQLite store of job listings, deduplicated by redirect link"""
+
+    def __init__(self, path=DEFAULT_CATALOG_PATH):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def upsert_jobs(self, category, country, jobs):
+        """Insert new listings and refresh existing ones. Returns the number of new listings."""
+        rows = [
+            (job["link"], job.get("id"), category, country, job.get("title"), job.get("company"),
+             job.get("location"), job.get("salary"), job.get("description"), job.get("source"),
+             job.get("date_posted"), time.time())
+            for job in jobs
+            if job.get("link") and job["link"] != "#"
+        ]
+        with closing(self._connect()) as conn, conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (link, job_id, category, country, title, company, location, "
+                "salary, description, source, date_posted, ingested_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            inserted = conn.total_changes - before
+            conn.executemany(
+                "UPDATE jobs SET title = ?, company = ?, location = ?, salary = ?, description = ?, "
+                "date_posted = ? WHERE link = ?",
+                [(r[4], r[5], r[6], r[7], r[8], r[10], r[0]) for r in rows]
+            )
+        return inserted
+
+    def get_sync_state(self, category, country):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT last_posted FROM sync_state WHERE category = ? AND country = ?", (category, country)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_sync_state(self, category, country, last_posted):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO sync_state (category, country, last_posted, last_synced) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(category, country) DO UPDATE SET "
+                "last_posted = MAX(COALESCE(last_posted, ''), excluded.last_posted), last_synced = excluded.last_synced",
+                (category, country, last_posted or "", time.time())
+            )
+
+    def get_jobs(self, category, country, limit=10):
+        """Return the newest cataloged listings for a category and country"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE category = ? AND country = ? "
+                "ORDER BY date_posted DESC LIMIT ?",
+                (category, country, limit)
+            ).fetchall()
+        return [dict(zip(JOB_COLUMNS, row)) for row in rows]
+
+    def iter_all_jobs(self):
+        """Yield every cataloged listing, e.g. to build a job_index.JobIndex"""
+        with closing(self._connect()) as conn:
+            for row in conn.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs"):
+                yield dict(zip(JOB_COLUMNS, row))
+
+    def stats(self):
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT category, country, COUNT(*) FROM jobs GROUP BY category, country ORDER BY category, country"
+            ).fetchall()
+
+async def _sync_one(client, catalog, category, search_term, country, pages, per_page, full):
+    """Page through newest-first results until reaching listings already synced"""
+    last_posted = None if full else catalog.get_sync_state(category, country)
+    params = {"sort_by": "date"}
+    if last_posted:
+        # Only ask for listings posted since the previous sync (plus a day of overlap)
+        last_date = _parse_date(last_posted)
+        if last_date is not None:
+            age_days = (datetime.now(timezone.utc) - last_date.astimezone(timezone.utc)).total_seconds() / 86400
+            params["max_days_old"] = max(1, math.ceil(age_days) + 1)
+
+    inserted, newest = 0, last_posted
+    for page in range(1, pages + 1):
+        jobs = await client.search(search_term, country, page, per_page, **params)
+        inserted += await asyncio.to_thread(catalog.upsert_jobs, category, country, jobs)
+        dates = [job["date_posted"] for job in jobs if job.get("date_posted")]
+        if dates:
+            newest = max([newest or ""] + dates)
+        if len(jobs) < per_page or (last_posted and dates and min(dates) <= last_posted):
+            break
+
+    await asyncio.to_thread(catalog.set_sync_state, category, country, newest)
+    return inserted
+
+async def sync_catalog_async(catalog, app_id, app_key, categories=None, countries=None,
+                             pages=5, per_page=50, full=False, workers=DEFAULT_SYNC_WORKERS,
+                             budget_reserve=DEFAULT_SYNC_RESERVE, **client_kwargs):
+    """
+    Sync every (category, country) pair. Returns {(category, country): new listings}.
+
+    A fixed set of workers takes pairs from a queue, so only that many wait
+    on the request budget at a time and each waits for a token without a
+    timeout. Sync stops taking pairs once it reaches budget_reserve calls
+    short of the daily limit; pairs it never started count 0.
+    """
+    from jobsearch import SEARCH_TERMS
+
+    categories = categories or list(SEARCH_TERMS)
+    countries = countries or SUPPORTED_COUNTRIES
+    pairs = [(category, country) for category in categories for country in countries]
+    queue = asyncio.Queue()
+    for pair in pairs:
+        queue.put_nowait(pair)
+    summary = {}
+    budget_exhausted = False
+
+    async def worker(client):
+        nonlocal budget_exhausted
+        while not budget_exhausted:
+            try:
+                category, country = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                summary[category, country] = await _sync_one(
+                    client, catalog, category, SEARCH_TERMS.get(category, category), country, pages, per_page, full
+                )
+            except AdzunaError as e:
+                logger.warning("Sync failed for %s/%s: %s", category, country, e)
+                summary[category, country] = 0
+                if isinstance(e.__cause__, DailyBudgetExhausted):
+                    budget_exhausted = True
+
+    client_kwargs = {"acquire_timeout": None, **client_kwargs, "budget_reserve": budget_reserve}
+    async with AdzunaClient(app_id, app_key, **client_kwargs) as client:
+        await asyncio.gather(*(worker(client) for _ in range(max(1, min(workers, len(pairs))))))
+
+    skipped = [pair for pair in pairs if pair not in summary]
+    if skipped:
+        logger.warning("Daily API budget reached; %d category/country pairs not synced", len(skipped))
+    return {pair: summary.get(pair, 0) for pair in pairs}
+
+def sync_catalog(catalog, app_id, app_key, **kwargs):
+    """Blocking wrapper around sync_catalog_async"""
+    return asyncio.run(sync_catalog_async(catalog, app_id, app_key, **kwargs))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest Adzuna listings into the local job catalog")
+    parser.add_argument("--catalog", default=os.environ.get("JOB_CATALOG_PATH", DEFAULT_CATALOG_PATH))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    sync_parser = subparsers.add_parser("sync", help="Fetch new listings for every category and country")
+    sync_parser.add_argument("--countries", nargs="+", default=None, help=f"Default: {' '.join(SUPPORTED_COUNTRIES)}")
+    sync_parser.add_argument("--categories", nargs="+", default=None, help="Default: every category in SEARCH_TERMS")
+    sync_parser.add_argument("--pages", type=int, default=5, help="Maximum pages per category and country")
+    sync_parser.add_argument("--per-page", type=int, default=50)
+    sync_parser.add_argument("--full", action="store_true", help="Ignore the last sync position")
+    sync_parser.add_argument("--workers", type=int, default=DEFAULT_SYNC_WORKERS,
+                             help="Category/country pairs synced at once")
+    sync_parser.add_argument("--reserve", type=int, default=DEFAULT_SYNC_RESERVE,
+                             help="Daily API calls to leave for interactive requests (env JOB_SYNC_RESERVE)")
+    subparsers.add_parser("stats", help="Show listing counts per category and country")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    catalog = JobCatalog(args.catalog)
+
+    if args.command == "sync":
+        app_id = os.environ.get("ADZUNA_APP_ID", "")
+        app_key = os.environ.get("ADZUNA_API_KEY", "")
+        if not app_id or not app_key:
+            raise SystemExit("Set ADZUNA_APP_ID and ADZUNA_API_KEY to sync the catalog")
+        # Ingestion draws on the same daily API budget as the app, minus the reserve
+        from jobsearch import get_request_budget
+        summary = sync_catalog(
+            catalog, app_id, app_key, categories=args.categories, countries=args.countries,
+            pages=args.pages, per_page=args.per_page, full=args.full, workers=args.workers,
+            budget_reserve=args.reserve, budget=get_request_budget()
+        )
+        print(f"Added {sum(summary.values())} new listings across {len(summary)} category/country pairs")
+    else:
+        for category, country, count in catalog.stats():
+            print(f"{category:35s} {country}  {count}")
+
+if __name__ == "__main__":
+    main()
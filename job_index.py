@@ -0,0 +1,219 @@
+# job_index.py - Local inverted index over cached job listings
+#
+# Build an index from a JSONL dump of Adzuna results and query it with a resume:
+#   python job_index.py build adzuna_dump.jsonl --output job_index.pkl
+#   python job_index.py search job_index.pkl resume.txt --top 10
+import argparse
+import heapq
+import json
+import math
+import pickle
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate
+
+from adzuna_client import format_adzuna_job
+from text_normalizer import content_tokens, tokenize
+
+def _job_terms(job):
+    return content_tokens(tokenize(f"{job.get('title', '')} {job.get('company', '')} {job.get('description', '')}"))
+
+def iter_jsonl_jobs(path):
+    """
+    Yield job dictionaries from a JSONL file
+
+    Each line may be a job dictionary as returned by get_adzuna_jobs, a raw
+    Adzuna result (has "redirect_url") or a whole Adzuna response page (has
+    "results").
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "results" in record:
+                for result in record["results"]:
+                    yield format_adzuna_job(result)
+            elif "redirect_url" in record:
+                yield format_adzuna_job(record)
+            else:
+                yield record
+
+class JobIndex:
+    """
+    Inverted index of job listings with BM25 scoring and MaxScore top-k retrieval
+
+    Every postings list stores sorted document ids next to their precomputed
+    BM25 impact, and each term keeps the maximum impact in its list as an
+    upper bound. search() walks the lists document-at-a-time and skips
+    documents that can no longer beat the current k-th best score.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.jobs = []
+        self._seen_links = set()
+        self._doc_terms = []
+        self._dirty = False
+        self.postings = {}
+        self.max_impact = {}
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def add(self, job):
+        """Add a job listing, skipping links already in the index. Returns True if added."""
+        link = job.get("link")
+        if link and link != "#":
+            if link in self._seen_links:
+                return False
+            self._seen_links.add(link)
+        self.jobs.append(job)
+        self._doc_terms.append(Counter(_job_terms(job)))
+        self._dirty = True
+        return True
+
+    def add_jobs(self, jobs):
+        return sum(1 for job in jobs if self.add(job))
+
+    def build(self):
+        """(Re)compute postings, BM25 impacts and per-term upper bounds"""
+        n_docs = len(self._doc_terms)
+        doc_lengths = [sum(counter.values()) for counter in self._doc_terms]
+        avg_length = (sum(doc_lengths) / n_docs) if n_docs else 0.0
+
+        raw_postings = {}
+        for doc_id, counter in enumerate(self._doc_terms):
+            for term, tf in counter.items():
+                raw_postings.setdefault(term, []).append((doc_id, tf))
+
+        self.postings = {}
+        self.max_impact = {}
+        for term, entries in raw_postings.items():
+            df = len(entries)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            doc_ids, impacts = [], []
+            for doc_id, tf in entries:
+                norm = self.k1 * (1 - self.b + self.b * doc_lengths[doc_id] / avg_length) if avg_length else self.k1
+                doc_ids.append(doc_id)
+                impacts.append(idf * tf * (self.k1 + 1) / (tf + norm))
+            self.postings[term] = (doc_ids, impacts)
+            self.max_impact[term] = max(impacts)
+        self._dirty = False
+
+    def search(self, resume_text=None, k=10, resume_tokens=None):
+        """
+        Return the top-k (job, score) pairs for a resume, best first
+
+        Each distinct resume term contributes its BM25 impact once. Scores are
+        identical to exhaustive scoring; MaxScore only skips work.
+        """
+        if self._dirty:
+            self.build()
+        if resume_tokens is None:
+            resume_tokens = tokenize(resume_text)
+        terms = sorted(
+            (term for term in set(content_tokens(resume_tokens)) if term in self.postings),
+            key=lambda term: self.max_impact[term]
+        )
+        if not terms or k <= 0:
+            return []
+
+        doc_lists = [self.postings[term][0] for term in terms]
+        impact_lists = [self.postings[term][1] for term in terms]
+        # bound_prefix[i] is the best score terms[0..i] can add together
+        bound_prefix = list(accumulate(self.max_impact[term] for term in terms))
+        n_terms = len(terms)
+        positions = [0] * n_terms
+        heap = []
+        threshold = 0.0
+        # terms[first_essential:] are essential: a new top-k document must contain one of them
+        first_essential = 0
+
+        while first_essential < n_terms:
+            candidate = None
+            for i in range(first_essential, n_terms):
+                if positions[i] < len(doc_lists[i]):
+                    doc_id = doc_lists[i][positions[i]]
+                    if candidate is None or doc_id < candidate:
+                        candidate = doc_id
+            if candidate is None:
+                break
+
+            score = 0.0
+            for i in range(first_essential, n_terms):
+                position = positions[i]
+                if position < len(doc_lists[i]) and doc_lists[i][position] == candidate:
+                    score += impact_lists[i][position]
+                    positions[i] = position + 1
+
+            # Non-essential terms, highest bound first, while they can still matter
+            for i in range(first_essential - 1, -1, -1):
+                if score + bound_prefix[i] <= threshold:
+                    break
+                position = bisect_left(doc_lists[i], candidate, positions[i])
+                positions[i] = position
+                if position < len(doc_lists[i]) and doc_lists[i][position] == candidate:
+                    score += impact_lists[i][position]
+
+            if len(heap) < k:
+                heapq.heappush(heap, (score, -candidate))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, -candidate))
+            else:
+                continue
+
+            if len(heap) == k:
+                threshold = heap[0][0]
+                while first_essential < n_terms and bound_prefix[first_essential] <= threshold:
+                    first_essential += 1
+
+        return [(self.jobs[-doc_id], score) for score, doc_id in sorted(heap, reverse=True)]
+
+    def save(self, path):
+        if self._dirty:
+            self.build()
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    @classmethod
+    def from_jsonl(cls, path, **kwargs):
+        index = cls(**kwargs)
+        index.add_jobs(iter_jsonl_jobs(path))
+        index.build()
+        return index
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query a local job-listing index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Index a JSONL dump of job listings")
+    build_parser.add_argument("jsonl", nargs="+")
+    build_parser.add_argument("--output", "-o", default="job_index.pkl")
+    search_parser = subparsers.add_parser("search", help="Find the best listings for a resume text file")
+    search_parser.add_argument("index")
+    search_parser.add_argument("resume")
+    search_parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = JobIndex()
+        for path in args.jsonl:
+            index.add_jobs(iter_jsonl_jobs(path))
+        index.save(args.output)
+        print(f"Indexed {len(index)} listings ({len(index.postings)} terms) -> {args.output}")
+    else:
+        index = JobIndex.load(args.index)
+        with open(args.resume, encoding="utf-8") as f:
+            resume_text = f.read()
+        for job, score in index.search(resume_text, k=args.top):
+            print(f"{score:7.3f}  {job['title']} at {job['company']} ({job['link']})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# job_providers.py - Pluggable job sources fetched concurrently
+import csv
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from adzuna_client import country_code_for, fetch_jobs_concurrently, merge_jobs
+from job_cache import JobCache
+from text_normalizer import tokenize
+
+logger = logging.getLogger(__name__)
+
+class ProviderUnavailable(Exception):
+    """Raised by a provider that can't serve requests (e.g. missing credentials)"""
+
+class JobProvider:
+    """
+    A source of job listings
+
+    Subclasses implement fetch(). timeout is the provider's deadline in
+    seconds inside fan_out(). backfill providers (slow or metered sources)
+    are only consulted when the regular providers came back short of the
+    limit; fallback providers only when nothing was found at all.
+    """
+    name = "provider"
+    timeout = 5.0
+    backfill = False
+    fallback = False
+
+    def fetch(self, search_term, location, limit, category=None):
+        """Return up to limit job dictionaries, raising on failure"""
+        raise NotImplementedError
+
+class AdzunaProvider(JobProvider):
+    """Live Adzuna search, going through the shared cache, budget and request coalescing"""
+    name = "adzuna"
+    # Every call costs budget and may take seconds, so only fill gaps local sources leave
+    backfill = True
+
+    def __init__(self, app_id, app_key, cache=None, budget=None, single_flight=None, timeout=8.0):
+        self.app_id = app_id
+        self.app_key = app_key
+        self.cache = cache
+        self.budget = budget
+        self.single_flight = single_flight
+        self.timeout = timeout
+
+    def fetch(self, search_term, location, limit, category=None):
+        if not self.app_id or not self.app_key:
+            raise ProviderUnavailable("Adzuna API keys not configured")
+        country_code = country_code_for(location)
+
+        def fetch_live():
+            return fetch_jobs_concurrently(
+                self.app_id, self.app_key, [search_term], [country_code], results_per_page=limit,
+                budget=self.budget
+            )
+
+        def lookup():
+            if self.cache is None:
+                return fetch_live()
+            return self.cache.get_or_fetch(search_term, country_code, limit, fetch_live)
+
+        if self.single_flight is None:
+            return lookup()
+        return self.single_flight.do(JobCache.make_key(search_term, country_code, limit), lookup)
+
+class CatalogProvider(JobProvider):
+    """Listings from the offline catalog filled by job_catalog.py"""
+    name = "catalog"
+    timeout = 1.0
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+
+    def fetch(self, search_term, location, limit, category=None):
+        return self.catalog.get_jobs(category or search_term, country_code_for(location), limit)
+
+class LocalFeedProvider(JobProvider):
+    """
+    Listings from a local JSON, JSONL or CSV file of job dictionaries
+
+    The file is reloaded when it changes. A listing matches when every word
+    of the search term appears in its title and, unless the location is
+    "remote", the location name appears in its location.
+    """
+    name = "feed"
+    timeout = 2.0
+
+    def __init__(self, path):
+        self.path = path
+        self._jobs = []
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        mtime = os.path.getmtime(self.path)
+        with self._lock:
+            if mtime == self._mtime:
+                return self._jobs
+            with open(self.path, encoding="utf-8", newline="") as f:
+                if self.path.endswith(".csv"):
+                    jobs = list(csv.DictReader(f))
+                elif self.path.endswith(".jsonl"):
+                    jobs = [json.loads(line) for line in f if line.strip()]
+                else:
+                    jobs = json.load(f)
+            for job in jobs:
+                job.setdefault("source", "Local Feed")
+                job["_title_tokens"] = set(tokenize(job.get("title", "")))
+            self._jobs, self._mtime = jobs, mtime
+            return jobs
+
+    def fetch(self, search_term, location, limit, category=None):
+        wanted = set(tokenize(search_term))
+        location = location.lower()
+        matches = []
+        for job in self._load():
+            if not wanted <= job["_title_tokens"]:
+                continue
+            if location != "remote" and location not in job.get("location", "").lower():
+                continue
+            matches.append({k: v for k, v in job.items() if not k.startswith("_")})
+            if len(matches) >= limit:
+                break
+        return matches
+
+class DummyProvider(JobProvider):
+    """Sample listings, used only when every other provider came back empty"""
+    name = "dummy"
+    timeout = 1.0
+    fallback = True
+
+    def fetch(self, search_term, location, limit, category=None):
+        from jobsearch import get_dummy_jobs
+        return get_dummy_jobs(search_term, limit)
+
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="job-provider")
+
+def fan_out(providers, search_term, location, limit, category=None):
+    """
+    Query providers tier by tier and merge their listings
+
+    Regular providers are queried concurrently. Backfill providers run next,
+    also concurrently, only if the regular ones returned fewer than limit
+    listings, and fallback providers only if nothing was found. Within a
+    tier each provider's results are used only if they arrive within its own
+    timeout, so a tier takes at most its largest timeout. Results are merged
+    in provider order, deduped by link and cut to limit.
+
+    Tiers run one after another, so the worst case is the sum of each tier's
+    largest timeout, not the slowest single provider: with the defaults, 2s
+    for catalog and feed, then 8s for Adzuna, then 1s for the sample data.
+    Backfill is deliberately not started early, because a metered call whose
+    result is discarded still spends the API budget.
+
+    Returns:
+        (jobs, report) where report maps provider name to a status string;
+        backfill providers that weren't needed report "unused (limit filled)"
+    """
+    report = {}
+
+    def collect(group):
+        start = time.monotonic()
+        futures = [
+            (provider, _executor.submit(provider.fetch, search_term, location, limit, category))
+            for provider in group
+        ]
+        job_lists = []
+        for provider, future in futures:
+            remaining = max(0.0, start + provider.timeout - time.monotonic())
+            try:
+                jobs = future.result(timeout=remaining)
+                job_lists.append(jobs)
+                report[provider.name] = f"ok ({len(jobs)})"
+            except FutureTimeoutError:
+                # Left running in the background; a late result is simply dropped
+                report[provider.name] = "timeout"
+            except Exception as e:
+                report[provider.name] = f"error: {e}"
+                logger.warning("Job provider %s failed: %s", provider.name, e)
+        return job_lists
+
+    regular = [p for p in providers if not p.backfill and not p.fallback]
+    backfill = [p for p in providers if p.backfill and not p.fallback]
+    fallbacks = [p for p in providers if p.fallback]
+
+    job_lists = collect(regular)
+    jobs = merge_jobs(job_lists)[:limit]
+    if len(jobs) < limit and backfill:
+        job_lists += collect(backfill)
+        jobs = merge_jobs(job_lists)[:limit]
+    else:
+        report.update((provider.name, "unused (limit filled)") for provider in backfill)
+    if not jobs and fallbacks:
+        jobs = merge_jobs(collect(fallbacks))[:limit]
+    return jobs, report
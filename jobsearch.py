@@ -1,96 +1,98 @@
 # jobsearch.py - Place this file in the same folder as your main app
-import requests
-import re
+#
+# Job fetching and relevance scoring without any Streamlit dependency: the app
+# passes credentials in and shows the provider report itself. Problems are
+# logged to the "jobsearch" logger and timings go to the metrics hooks.
+import logging
+import numpy as np
 import os
-import streamlit as st
 from datetime import datetime
 from collections import Counter
+from scipy import sparse
+import metrics
+from text_normalizer import content_tokens, tokenize
+from adzuna_client import AdzunaError
+from job_cache import DEFAULT_CACHE_PATH, JobCache
+from job_catalog import DEFAULT_CATALOG_PATH, JobCatalog
+from rate_limit import DEFAULT_BUDGET_PATH, RequestBudget, SingleFlight
+from job_providers import AdzunaProvider, CatalogProvider, DummyProvider, LocalFeedProvider, fan_out
 
-@st.cache_data(ttl=3600)
-def get_adzuna_jobs(job_title, location="gb", limit=10):
+logger = logging.getLogger(__name__)
+
+_job_cache = None
+
+def get_job_cache():
+    """Return the process-wide handle on the shared SQLite job cache"""
+    global _job_cache
+    if _job_cache is None:
+        _job_cache = JobCache(
+            os.environ.get("JOB_CACHE_PATH", DEFAULT_CACHE_PATH),
+            fresh_ttl=int(os.environ.get("JOB_CACHE_TTL", "3600"))
+        )
+    return _job_cache
+
+_request_budget = None
+_single_flight = SingleFlight()
+
+def get_request_budget():
+    """Return the cross-process token bucket and daily budget for Adzuna calls"""
+    global _request_budget
+    if _request_budget is None:
+        _request_budget = RequestBudget(
+            os.environ.get("JOB_API_BUDGET_PATH", DEFAULT_BUDGET_PATH),
+            rate_per_second=float(os.environ.get("ADZUNA_CALLS_PER_MINUTE", "25")) / 60,
+            daily_limit=int(os.environ.get("ADZUNA_DAILY_BUDGET", "100"))
+        )
+    return _request_budget
+
+# Adzuna API credentials - store these securely
+def get_adzuna_credentials(secrets=None):
+    """Return (app_id, app_key) from a secrets mapping such as st.secrets, else the environment"""
+    secrets = secrets if secrets is not None else {}
+    app_id = secrets.get("ADZUNA_APP_ID") or os.environ.get("ADZUNA_APP_ID", "")
+    app_key = secrets.get("ADZUNA_API_KEY") or os.environ.get("ADZUNA_API_KEY", "")
+    return app_id, app_key
+
+def get_adzuna_provider(app_id, app_key):
+    """Adzuna provider wired to the shared cache, request budget and request coalescing"""
+    return AdzunaProvider(
+        app_id, app_key, cache=get_job_cache(), budget=get_request_budget(), single_flight=_single_flight
+    )
+
+def get_adzuna_jobs(job_title, location="gb", limit=10, app_id=None, app_key=None):
     """
     Get job listings from Adzuna API
     
+    Results are cached in a SQLite database shared by all worker processes;
+    expired entries are served immediately and refreshed in the background.
+    
     Args:
         job_title: Job title to search for
         location: Country code (gb, us, au, etc.)
         limit: Number of results to return
+        app_id, app_key: Adzuna credentials (default: from the environment)
         
     Returns:
         List of job dictionaries
     """
     try:
-        # Adzuna API credentials - store these securely
-        ADZUNA_APP_ID = st.secrets.get("", os.environ.get("ADZUNA_APP_ID", ""))
-        ADZUNA_API_KEY = st.secrets.get("ADZUNA_API_KEY", os.environ.get("ADZUNA_API_KEY", ""))
+        if app_id is None or app_key is None:
+            app_id, app_key = get_adzuna_credentials()
         
-        if not ADZUNA_APP_ID or not ADZUNA_API_KEY:
-            st.sidebar.warning("Adzuna API keys not configured. Using sample data.")
+        if not app_id or not app_key:
+            logger.warning("Adzuna API keys not configured. Using sample data.")
             return get_dummy_jobs(job_title, limit)
-            
-        # Convert common location names to country codes
-        location_map = {
-            "united states": "us",
-            "usa": "us",
-            "uk": "gb",
-            "united kingdom": "gb",
-            "australia": "au",
-            "canada": "ca",
-            "germany": "de",
-            "india": "in",
-            "remote": "gb"  # Default to GB for remote
-        }
-        
-        country_code = location_map.get(location.lower(), "in")
-        
-        # API endpoint
-        base_url = f"https://api.adzuna.com/v1/api/jobs/{country_code}/search/1"
-        
-        # Parameters
-        params = {
-            "app_id": ADZUNA_APP_ID,
-            "app_key": ADZUNA_API_KEY,
-            "results_per_page": limit,
-            "what": job_title,
-            "content-type": "application/json"
-        }
-        
-        # Make the request
-        response = requests.get(base_url, params=params)
         
-        if response.status_code != 200:
-            st.sidebar.warning(f"Adzuna API error: {response.status_code}")
+        try:
+            jobs = get_adzuna_provider(app_id, app_key).fetch(job_title, location, limit)
+        except AdzunaError as e:
+            logger.warning("Adzuna request failed: %s", e, extra={"search_term": job_title, "location": location})
             return get_dummy_jobs(job_title, limit)
         
-        # Parse the response
-        data = response.json()
-        
-        # Extract job listings
-        jobs = []
-        for result in data.get("results", []):
-            # Format salary if available
-            salary_info = result.get("salary_is_predicted", "0") 
-            salary_text = "Not specified"
-            if salary_info == "0" and "salary_min" in result and "salary_max" in result:
-                min_salary = result.get("salary_min", 0)
-                max_salary = result.get("salary_max", 0)
-                if min_salary and max_salary:
-                    salary_text = f"{min_salary:,.0f} - {max_salary:,.0f} {result.get('salary_currency', '')}/year"
-            
-            jobs.append({
-                "title": result.get("title", "No title"),
-                "company": result.get("company", {}).get("display_name", "No company"),
-                "location": result.get("location", {}).get("display_name", "No location"),
-                "salary": salary_text,
-                "link": result.get("redirect_url", "#"),
-                "description": result.get("description", "No description available"),
-                "source": "Adzuna"
-            })
-        
         return jobs if jobs else get_dummy_jobs(job_title, limit)
         
     except Exception as e:
-        st.sidebar.warning(f"Error fetching Adzuna jobs: {str(e)}")
+        logger.warning("Error fetching Adzuna jobs: %s", e, extra={"search_term": job_title, "location": location})
         return get_dummy_jobs(job_title, limit)
 
 # Fallback implementation
@@ -150,61 +152,108 @@ def get_dummy_jobs(job_title, num_listings=5):
         }
     ][:num_listings]
 
-# Master function to get jobs from Adzuna
-def get_job_recommendations(job_category, location="remote", num_listings=5):
-    """Get job recommendations from Adzuna"""
+# Map job categories to search terms
+SEARCH_TERMS = {
+    "Data Science": "Data Scientist",
+    "Machine Learning Engineering": "Machine Learning Engineer", 
+    "Frontend Development": "Frontend Developer",
+    "Backend Development": "Backend Developer",
+    "UI/UX Design": "UI UX Designer",
+    "Full Stack Development": "Full Stack Developer",
+    "DevOps Engineering": "DevOps Engineer",
+    "Software Engineering": "Software Engineer",
+    "Software Development": "Software Developer",
+    "Cloud Architecture": "Cloud Architect"
+}
+
+_job_catalog = None
+
+def get_job_catalog():
+    """Return the offline job catalog filled by job_catalog.py, or None if it hasn't been synced"""
+    global _job_catalog
+    catalog_path = os.environ.get("JOB_CATALOG_PATH", DEFAULT_CATALOG_PATH)
+    if _job_catalog is None and os.path.exists(catalog_path):
+        _job_catalog = JobCatalog(catalog_path)
+    return _job_catalog
+
+# Enabled job sources, in merge priority order
+def get_job_providers(app_id="", app_key=""):
+    """
+    Build the providers named in JOB_PROVIDERS (default "catalog,feed,adzuna")
+
+    catalog and feed are skipped when the catalog hasn't been synced or
+    JOB_FEED_PATH isn't set. adzuna is a backfill provider, so it is only
+    called when the local sources can't fill the request. Sample data is
+    always appended as the fallback.
+    """
+    providers = []
+    for name in os.environ.get("JOB_PROVIDERS", "catalog,feed,adzuna").split(","):
+        name = name.strip().lower()
+        if name == "catalog" and get_job_catalog() is not None:
+            providers.append(CatalogProvider(get_job_catalog()))
+        elif name == "feed" and os.environ.get("JOB_FEED_PATH"):
+            providers.append(LocalFeedProvider(os.environ["JOB_FEED_PATH"]))
+        elif name == "adzuna":
+            providers.append(get_adzuna_provider(app_id, app_key))
+    providers.append(DummyProvider())
+    return providers
+
+# Query every enabled provider and report how each one did
+def find_jobs(job_category, location="remote", num_listings=5, app_id="", app_key=""):
+    """
+    Get jobs for a category from all enabled providers concurrently
+
+    Returns:
+        (jobs, report) where report maps provider name to "ok (n)", "timeout",
+        "unused (limit filled)" or "error: ..."
+    """
+    # Get appropriate search term
+    search_term = SEARCH_TERMS.get(job_category, job_category)
+    providers = get_job_providers(app_id, app_key)
+    
+    with metrics.timed("jobs.fetch", category=job_category):
+        jobs, report = fan_out(providers, search_term, location, num_listings, category=job_category)
+    
+    for name, status in report.items():
+        metrics.increment("jobs.provider", provider=name, status=status.split(" ")[0].rstrip(":"))
+        if not status.startswith(("ok", "unused")):
+            logger.warning("Job source %s skipped: %s", name, status,
+                           extra={"provider": name, "category": job_category, "location": location})
+    return jobs, report
+
+# Master function to get jobs from every enabled provider
+def get_job_recommendations(job_category, location="remote", num_listings=5, app_id=None, app_key=None):
+    """Get job recommendations from all enabled providers, falling back to sample data on errors"""
     try:
-        # Map job categories to search terms
-        search_terms = {
-            "Data Science": "Data Scientist",
-            "Machine Learning Engineering": "Machine Learning Engineer", 
-            "Frontend Development": "Frontend Developer",
-            "Backend Development": "Backend Developer",
-            "UI/UX Design": "UI UX Designer",
-            "Full Stack Development": "Full Stack Developer",
-            "DevOps Engineering": "DevOps Engineer",
-            "Software Engineering": "Software Engineer",
-            "Software Development": "Software Developer",
-            "Cloud Architecture": "Cloud Architect"
-        }
-        
-        # Get appropriate search term
-        search_term = search_terms.get(job_category, job_category)
-        
-        # Get jobs from Adzuna
-        with st.spinner(f"Finding {search_term} jobs..."):
-            jobs = get_adzuna_jobs(search_term, location, num_listings)
-            return jobs
+        if app_id is None or app_key is None:
+            app_id, app_key = get_adzuna_credentials()
+        jobs, _ = find_jobs(job_category, location, num_listings, app_id, app_key)
+        return jobs
     
     except Exception as e:
-        st.warning(f"Error fetching job listings: {str(e)}")
+        logger.warning("Error fetching job listings: %s", e, extra={"category": job_category, "location": location})
         return get_dummy_jobs(job_category, num_listings)
 
 # Relevance scoring function
-def score_job_relevance(resume_text, job_listing):
-    """Score the relevance of a job listing to a resume"""
-    
-    # Clean and normalize text
-    resume_text = resume_text.lower()
+def score_job_relevance(resume_text, job_listing, resume_tokens=None):
+    """
+    Score the relevance of a job listing to a resume
+
+    Pass resume_tokens (from text_normalizer.tokenize) when scoring one resume
+    against many listings so the resume is only tokenized once.
+    """
+    if resume_tokens is None:
+        resume_tokens = tokenize(resume_text)
     
     # Combine job title, company, and description for matching
-    job_text = f"{job_listing['title']} {job_listing['company']} {job_listing['description']}".lower()
-    
-    # Remove common punctuation
-    resume_text = re.sub(r'[^\w\s]', ' ', resume_text)
-    job_text = re.sub(r'[^\w\s]', ' ', job_text)
-    
-    # Extract words (excluding common stop words)
-    stop_words = {'a', 'an', 'the', 'and', 'or', 'but', 'is', 'are', 'in', 'to', 'for', 'with', 'on', 'at', 'from', 'by'}
-    resume_words = [word for word in re.findall(r'\b\w+\b', resume_text) if word not in stop_words]
-    job_words = [word for word in re.findall(r'\b\w+\b', job_text) if word not in stop_words]
+    job_text = f"{job_listing['title']} {job_listing['company']} {job_listing['description']}"
     
-    # Convert to frequency Counter
-    resume_counter = Counter(resume_words)
-    job_counter = Counter(job_words)
+    # Extract words (excluding common stop words) and convert to frequency Counter
+    resume_counter = Counter(content_tokens(resume_tokens))
+    job_counter = Counter(content_tokens(tokenize(job_text)))
     
     # Calculate TF-IDF like score for matching
-    common_words = set(resume_counter.keys()) & set(job_counter.keys())
+    common_words = resume_counter.keys() & job_counter.keys()
     
     if not common_words:
         return 0.0
@@ -218,7 +267,105 @@ def score_job_relevance(resume_text, job_listing):
             score += word_score
     
     # Normalize score
-    max_possible = min(len(set(resume_counter.keys())), len(set(job_counter.keys())))
+    max_possible = min(len(resume_counter), len(job_counter))
     normalized_score = min(score / max_possible if max_possible > 0 else 0, 1.0)
     
-    return normalized_score
\ No newline at end of file
+    return normalized_score
+
+# Build a sparse count matrix over listings in one pass
+def build_term_matrix(token_lists, vocabulary=None):
+    """
+    Count tokens per row into a CSR matrix
+
+    Args:
+        token_lists: One token list per row
+        vocabulary: Optional fixed {term: column} map; other terms are not stored.
+            When omitted the vocabulary grows as new terms are seen.
+
+    Returns:
+        (matrix, vocabulary, unique_counts) where unique_counts holds the number
+        of distinct terms in each row, including terms outside the vocabulary
+    """
+    grow = vocabulary is None
+    if grow:
+        vocabulary = {}
+    indptr, indices, data, unique_counts = [0], [], [], []
+    for tokens in token_lists:
+        counter = Counter(tokens)
+        unique_counts.append(len(counter))
+        for term, count in counter.items():
+            column = vocabulary.get(term)
+            if column is None:
+                if not grow:
+                    continue
+                column = vocabulary[term] = len(vocabulary)
+            indices.append(column)
+            data.append(count)
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(unique_counts), len(vocabulary))
+    )
+    return matrix, vocabulary, np.asarray(unique_counts, dtype=np.float64)
+
+def _job_text(job_listing):
+    return f"{job_listing['title']} {job_listing['company']} {job_listing['description']}"
+
+# Batch relevance scoring function
+def score_jobs_relevance(resume_text, job_listings, resume_tokens=None, mode="ratio"):
+    """
+    Score every job listing against one resume with vectorized operations
+
+    Args:
+        resume_text: Raw resume text
+        job_listings: List of job dictionaries
+        resume_tokens: Optional tokens from text_normalizer.tokenize(resume_text)
+        mode: "ratio" gives exactly the score_job_relevance semantics - the sum of
+            min/max count ratios over shared words longer than 3 characters,
+            divided by the smaller distinct-word count and capped at 1.
+            "tfidf" gives the cosine similarity of smoothed TF-IDF vectors, with
+            document frequencies taken over the resume and these listings.
+
+    Returns:
+        NumPy array of scores in [0, 1], one per listing
+    """
+    if not job_listings:
+        return np.zeros(0)
+    if resume_tokens is None:
+        resume_tokens = tokenize(resume_text)
+    resume_words = content_tokens(resume_tokens)
+    job_words = [content_tokens(tokenize(_job_text(job))) for job in job_listings]
+    
+    if mode == "tfidf":
+        matrix, _, _ = build_term_matrix([resume_words] + job_words)
+        n_docs = matrix.shape[0]
+        document_frequency = np.bincount(matrix.indices, minlength=matrix.shape[1])
+        idf = np.log((1 + n_docs) / (1 + document_frequency)) + 1
+        weighted = matrix @ sparse.diags(idf)
+        norms = np.sqrt(np.asarray(weighted.power(2).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        weighted = sparse.diags(1 / norms) @ weighted
+        similarities = weighted[1:] @ weighted[0].T
+        return np.clip(similarities.toarray().ravel(), 0.0, 1.0)
+    
+    if mode != "ratio":
+        raise ValueError(f"Unknown scoring mode: {mode}")
+    
+    resume_counter = Counter(resume_words)
+    # Only words longer than 3 characters contribute to the score
+    vocabulary = {word: i for i, word in enumerate(w for w in resume_counter if len(w) > 3)}
+    resume_counts = np.zeros(len(vocabulary))
+    for word, column in vocabulary.items():
+        resume_counts[column] = resume_counter[word]
+    
+    job_matrix, _, job_unique = build_term_matrix(job_words, vocabulary)
+    
+    # min/max count ratio for every shared word, summed per listing
+    shared_resume_counts = resume_counts[job_matrix.indices]
+    job_matrix.data = np.minimum(job_matrix.data, shared_resume_counts) / np.maximum(job_matrix.data, shared_resume_counts)
+    scores = np.asarray(job_matrix.sum(axis=1)).ravel()
+    
+    max_possible = np.minimum(len(resume_counter), job_unique)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normalized = np.where(max_possible > 0, scores / max_possible, 0.0)
+    return np.minimum(normalized, 1.0)
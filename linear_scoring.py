@@ -0,0 +1,118 @@
+# linear_scoring.py - Precompiled scoring for linear SVM and Naive Bayes models
+import weakref
+
+import numpy as np
+from scipy import sparse
+
+# Estimators whose decision_function is exactly X @ coef_.T + intercept_
+LINEAR_DECISION_MODELS = {'LinearSVC', 'SGDClassifier', 'RidgeClassifier', 'Perceptron', 'PassiveAggressiveClassifier'}
+
+# Attribute an exported estimator carries its compiled weights under (see attach_compiled_weights)
+COMPILED_WEIGHTS_ATTR = '_linear_scorer_weights'
+
+class LinearScorer:
+    """
+    Score a sparse feature matrix with one matmul against contiguous float32 weights
+
+    link selects how the raw X @ W + b scores become the model's output:
+        'decision'       - decision_function values (LinearSVC, hinge SGD, ...)
+        'softmax'        - MultinomialNB joint log likelihoods -> predict_proba
+        'log_loss'       - SGDClassifier(loss='log_loss') one-vs-rest predict_proba
+        'modified_huber' - SGDClassifier(loss='modified_huber') predict_proba
+    """
+
+    def __init__(self, weights, bias, link='decision'):
+        # (n_features, n_classes) so a CSR row block multiplies without transposes.
+        # Weights that already are float32 and C-contiguous (e.g. memory-mapped
+        # from an exported artifact) are used in place, not copied.
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self.bias = np.ascontiguousarray(bias, dtype=np.float32)
+        self.link = link
+        self.is_probability = link != 'decision'
+
+    def scores(self, features, return_decision=False):
+        """
+        Return the full (n_samples, n_classes) score matrix
+
+        With return_decision=True, return (scores, decision) where decision is
+        the raw X @ W + b matrix. Its argmax is the model's predict(), even
+        where a probability link saturates and ties several classes.
+        """
+        if sparse.issparse(features):
+            features = features.tocsr().astype(np.float32)
+        else:
+            features = np.asarray(features, dtype=np.float32)
+        raw_scores = np.asarray(features @ self.weights) + self.bias
+        decision = raw_scores.copy() if return_decision and self.link != 'decision' else raw_scores
+
+        if self.link == 'softmax':
+            raw_scores -= raw_scores.max(axis=1, keepdims=True)
+            np.exp(raw_scores, out=raw_scores)
+        elif self.link == 'log_loss':
+            raw_scores = 1 / (1 + np.exp(-raw_scores))
+        elif self.link == 'modified_huber':
+            raw_scores = (np.clip(raw_scores, -1, 1) + 1) / 2
+        else:
+            return (raw_scores, decision) if return_decision else raw_scores
+
+        # Same normalization sklearn applies, including uniform rows when all scores are 0
+        totals = raw_scores.sum(axis=1, keepdims=True)
+        uniform = totals == 0
+        raw_scores = np.where(uniform, 1 / raw_scores.shape[1], raw_scores / np.where(uniform, 1, totals))
+        return (raw_scores, decision) if return_decision else raw_scores
+
+def compile_linear_scorer(model):
+    """Build a LinearScorer for a supported multiclass model, or None"""
+    compiled = getattr(model, COMPILED_WEIGHTS_ATTR, None)
+    if compiled is not None:
+        return LinearScorer(compiled['weights'], compiled['bias'], link=compiled['link'])
+
+    model_type = type(model).__name__
+    classes = getattr(model, 'classes_', None)
+    if classes is None or len(classes) < 3:
+        return None
+
+    if model_type == 'MultinomialNB':
+        return LinearScorer(model.feature_log_prob_.T, model.class_log_prior_, link='softmax')
+
+    if model_type not in LINEAR_DECISION_MODELS:
+        return None
+    if not hasattr(model, 'predict_proba'):
+        link = 'decision'
+    elif model_type == 'SGDClassifier' and model.loss in ('log_loss', 'modified_huber'):
+        link = model.loss
+    else:
+        return None
+
+    coef = model.coef_
+    if sparse.issparse(coef):
+        coef = coef.toarray()
+    if coef.shape[0] != len(classes):
+        return None
+    return LinearScorer(coef.T, np.broadcast_to(model.intercept_, len(classes)), link=link)
+
+def attach_compiled_weights(model):
+    """
+    Store a model's float32 scoring weights on it, returning True if it has any
+
+    Once the model is dumped with joblib and loaded with mmap_mode='r', the
+    scorer uses these mapped pages directly, so every process serving the
+    model shares one copy of its weights.
+    """
+    scorer = compile_linear_scorer(model)
+    if scorer is None:
+        return False
+    setattr(model, COMPILED_WEIGHTS_ATTR, {'weights': scorer.weights, 'bias': scorer.bias, 'link': scorer.link})
+    return True
+
+_scorers = weakref.WeakKeyDictionary()
+
+def get_linear_scorer(model):
+    """Return the cached LinearScorer for a model, compiling it on first use"""
+    try:
+        if model not in _scorers:
+            _scorers[model] = compile_linear_scorer(model)
+        return _scorers[model]
+    except TypeError:
+        # Objects that can't be weakly referenced are scored through sklearn
+        return None
@@ -0,0 +1,134 @@
+# metrics.py - Timing and counter hooks for the screening and job-search core
+#
+# Core modules report what they do here and never depend on a metrics backend.
+# Register a hook to forward measurements to logs, StatsD, Prometheus, etc.:
+#   metrics.add_hook(lambda kind, name, value, tags: print(kind, name, value, tags))
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_hooks = []
+_hooks_lock = threading.Lock()
+
+def add_hook(hook):
+    """Register hook(kind, name, value, tags); kind is "timing" (seconds) or "count" """
+    with _hooks_lock:
+        _hooks.append(hook)
+    return hook
+
+def remove_hook(hook):
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+def emit(kind, name, value, **tags):
+    """Send one measurement to every hook; a failing hook never breaks the caller"""
+    for hook in list(_hooks):
+        try:
+            hook(kind, name, value, tags)
+        except Exception:
+            logger.exception("Metrics hook %r failed", hook)
+
+def increment(name, value=1, **tags):
+    emit("count", name, value, **tags)
+
+def observe(name, seconds, **tags):
+    emit("timing", name, seconds, **tags)
+
+@contextmanager
+def timed(name, **tags):
+    """Time the block and report it with status="ok" or status="error" """
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        observe(name, time.perf_counter() - start, status=status, **tags)
+
+# Bucket upper bounds in seconds, roughly Prometheus' defaults
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One extra slot for observations above the last bound
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        slot = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[slot] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (inf if above every bucket)"""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if total == 0:
+            return None
+        rank, seen = q * total, 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+        with self._lock:
+            counts, total, total_seconds = list(self.counts), self.count, self.sum
+        quantiles = {f"p{int(q * 100)}": self.quantile(q) for q in (0.5, 0.95, 0.99)}
+        return dict(
+            {
+                "count": total,
+                "sum": total_seconds,
+                "buckets": {str(bound): count for bound, count in zip(self.buckets + ("+Inf",), counts)},
+            },
+            # inf isn't valid JSON
+            **{name: "+Inf" if value == float("inf") else value for name, value in quantiles.items()}
+        )
+
+class HistogramRecorder:
+    """Metrics hook keeping a LatencyHistogram per timing name and tag set, plus counter totals"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, kind, name, value, tags):
+        key = (name, tuple(sorted(tags.items())))
+        with self._lock:
+            if kind == "count":
+                self._counters[key] = self._counters.get(key, 0) + value
+                return
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self.buckets)
+        histogram.observe(value)
+
+    def snapshot(self):
+        """Return {"timings": {name: [...]}, "counts": {name: [...]}} with one entry per tag set"""
+        with self._lock:
+            histograms = list(self._histograms.items())
+            counters = list(self._counters.items())
+        result = {"timings": {}, "counts": {}}
+        # Tag values can mix types, so order tag sets by their repr
+        for (name, tags), histogram in sorted(histograms, key=lambda item: (item[0][0], repr(item[0][1]))):
+            result["timings"].setdefault(name, []).append(dict(histogram.snapshot(), tags=dict(tags)))
+        for (name, tags), value in sorted(counters, key=lambda item: (item[0][0], repr(item[0][1]))):
+            result["counts"].setdefault(name, []).append({"tags": dict(tags), "value": value})
+        return result
@@ -0,0 +1,219 @@
+# model_registry.py - Lazy loading of the pickled models and vectorizers
+#
+# Export memory-mappable copies of the models with:
+#   python model_registry.py export --models-dir ./models
+import argparse
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import joblib
+
+from linear_scoring import attach_compiled_weights, get_linear_scorer
+
+LABEL_ENCODER_FILE = 'label_encoder.pkl'
+
+# Short names callers use for artifacts stored under a file name
+ALIASES = {'label_encoder': LABEL_ENCODER_FILE}
+
+# Uncompressed joblib copies of a .pkl artifact live next to it with this suffix
+MMAP_SUFFIX = '.joblib'
+
+# Function to detect model feature count
+def get_model_feature_count(model):
+    """Detect the number of features a model expects"""
+    if hasattr(model, 'n_features_in_'):
+        return model.n_features_in_
+    elif hasattr(model, 'coef_') and hasattr(model.coef_, 'shape'):
+        return model.coef_.shape[1]
+    elif hasattr(model, 'feature_importances_') and hasattr(model.feature_importances_, 'shape'):
+        return model.feature_importances_.shape[0]
+    else:
+        return None
+
+def is_vectorizer_file(file_name):
+    return 'vectorizer' in file_name.lower()
+
+def is_model_file(file_name):
+    """True for classification model pickles (not vectorizers or the label encoder)"""
+    return (
+        file_name.endswith('.pkl') and
+        not file_name.startswith('tfidf_') and
+        not file_name.startswith('bow_') and
+        not file_name.startswith('count_') and
+        not file_name.startswith('label_encoder') and
+        not is_vectorizer_file(file_name)
+    )
+
+class ModelRegistry(Mapping):
+    """
+    Dict-like view over a models directory that unpickles artifacts on first use
+
+    Construction only lists the directory. Each artifact is loaded the first
+    time it is looked up and kept in an LRU cache of at most max_loaded
+    objects. Feature counts for auto-detection are recorded in model_info as
+    models load, so callers holding model_info see them without a rescan.
+    """
+
+    def __init__(self, models_dir, max_loaded=4, use_mmap=True):
+        self.models_dir = models_dir
+        self.max_loaded = max_loaded
+        self.paths = {}
+        self.mmap_paths = {}
+        for f in sorted(os.listdir(models_dir)):
+            path = os.path.join(models_dir, f)
+            if f.endswith('.pkl'):
+                self.paths[f] = path
+            elif use_mmap and f.endswith(MMAP_SUFFIX):
+                # Artifacts keep their .pkl name whichever format backs them
+                self.mmap_paths[f[:-len(MMAP_SUFFIX)] + '.pkl'] = path
+
+        # Prefer a joblib copy unless the pickle has been updated since the export
+        for name, mmap_path in list(self.mmap_paths.items()):
+            pkl_path = self.paths.get(name)
+            if pkl_path and os.path.getmtime(pkl_path) > os.path.getmtime(mmap_path):
+                del self.mmap_paths[name]
+            else:
+                self.paths[name] = pkl_path
+        self.paths = dict(sorted(self.paths.items()))
+        self.sizes = {
+            f: os.path.getsize(self.mmap_paths.get(f) or path)
+            for f, path in self.paths.items()
+        }
+        self.model_files = [f for f in self.paths if is_model_file(f)]
+        self.vectorizer_files = [f for f in self.paths if is_vectorizer_file(f)]
+        self.model_info = {}
+        self._loaded = OrderedDict()
+        self._lock = threading.RLock()
+
+        # Pipelines are recognisable by name alone - no need to unpickle them
+        for model_name in self.model_files:
+            if 'pipeline' in model_name.lower():
+                self.model_info[model_name] = {'is_pipeline': True}
+
+    def __getitem__(self, name):
+        name = ALIASES.get(name, name)
+        if name not in self.paths:
+            raise KeyError(name)
+        with self._lock:
+            if name in self._loaded:
+                self._loaded.move_to_end(name)
+                return self._loaded[name]
+
+            obj = self._load(name)
+            self._loaded[name] = obj
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+            return obj
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, name):
+        return ALIASES.get(name, name) in self.paths
+
+    def _load(self, name):
+        if name in self.mmap_paths:
+            # Arrays are mapped read-only, so processes share them via the page cache
+            obj = joblib.load(self.mmap_paths[name], mmap_mode='r')
+        else:
+            with open(self.paths[name], 'rb') as f:
+                obj = pickle.load(f)
+        self._detect_model_info(name, obj)
+        if name in self.model_files:
+            # Extract linear weights once so inference can skip the estimator
+            get_linear_scorer(obj)
+        return obj
+
+    def _detect_model_info(self, name, obj):
+        """Record the feature count of a freshly loaded non-pipeline model"""
+        if name not in self.model_files or name in self.model_info:
+            return
+        feature_count = get_model_feature_count(obj)
+        if feature_count:
+            self.model_info[name] = {
+                'vectorizer': 'tfidf_vectorizer.pkl',
+                'features': feature_count,
+                'is_pipeline': False
+            }
+
+    def is_loaded(self, name):
+        return name in self._loaded
+
+    def artifact_version(self, model_name):
+        """
+        Fingerprint the files behind model_name's predictions
+
+        Covers the model plus the vectorizers and label encoder, by size and
+        modification time, so retraining any of them under the same file name
+        gives a new version.
+        """
+        digest = hashlib.sha256()
+        for name in [model_name, LABEL_ENCODER_FILE] + self.vectorizer_files:
+            path = self.mmap_paths.get(name) or self.paths.get(name)
+            if path is None:
+                continue
+            stat = os.stat(path)
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        return digest.hexdigest()[:16]
+
+    def unload(self, name=None):
+        """Drop one (or every) loaded artifact from memory"""
+        with self._lock:
+            if name is None:
+                self._loaded.clear()
+            else:
+                self._loaded.pop(name, None)
+
+def export_mmap_artifacts(models_dir, out_dir=None):
+    """
+    Write an uncompressed joblib copy of every .pkl artifact in models_dir
+
+    joblib stores the numpy arrays inside each object (coefficients, IDF
+    weights, log probabilities) as raw buffers that load with mmap_mode='r',
+    so several worker processes on one host map the same pages instead of
+    each holding a private copy. Linear models also get their float32 scoring
+    weights attached, which LinearScorer uses straight from the mapping.
+
+    Only the linear models and the vectorizers' IDF weights benefit: tree
+    ensembles are object graphs that unpickle into private memory either way.
+
+    Returns:
+        List of written file paths
+    """
+    out_dir = out_dir or models_dir
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for f in sorted(os.listdir(models_dir)):
+        if not f.endswith('.pkl'):
+            continue
+        with open(os.path.join(models_dir, f), 'rb') as src:
+            obj = pickle.load(src)
+        if is_model_file(f):
+            attach_compiled_weights(obj)
+        out_path = os.path.join(out_dir, f[:-len('.pkl')] + MMAP_SUFFIX)
+        joblib.dump(obj, out_path, compress=0)
+        written.append(out_path)
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage model artifacts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Write memory-mappable joblib copies of the .pkl models "
+                                          "(shares the linear models' weights; tree ensembles stay per process)")
+    export_parser.add_argument("--models-dir", default="./models")
+    export_parser.add_argument("--out-dir", default=None, help="Defaults to the models directory")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        for path in export_mmap_artifacts(args.models_dir, args.out_dir):
+            print(f"Wrote {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
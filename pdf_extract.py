@@ -0,0 +1,75 @@
+# pdf_extract.py - PDF text extraction shared by the app and the bulk screener
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz  # PyMuPDF
+
+# Pages beyond this are ignored so huge attachments can't stall a request
+DEFAULT_MAX_PAGES = 50
+
+# Documents shorter than this are extracted serially - process hand-off costs more
+PARALLEL_MIN_PAGES = 8
+
+# One pool per worker count, created under a lock so concurrent sessions share it
+_pools = {}
+_pools_lock = threading.Lock()
+
+def _get_pool(workers):
+    """Return the shared process pool for this worker count, creating it on first use"""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # Pools are kept, not replaced: another thread may still be submitting to one
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+# Worker: open a private document handle and extract one page range
+def _extract_page_range(data, start, stop):
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return [doc[i].get_text() for i in range(start, stop)]
+
+def split_page_ranges(page_count, parts):
+    """Split [0, page_count) into at most `parts` contiguous (start, stop) ranges"""
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges, start = [], 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+def extract_pdf_pages(data, max_pages=DEFAULT_MAX_PAGES, workers=1):
+    """
+    Extract the text of each page of an in-memory PDF
+
+    Args:
+        data: PDF bytes (or any buffer PyMuPDF can open as a stream)
+        max_pages: Only the first max_pages pages are read (None for no cap)
+        workers: Processes to spread page ranges over (None for CPU count)
+
+    Returns:
+        List of page texts in page order
+    """
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        page_count = doc.page_count if max_pages is None else min(doc.page_count, max_pages)
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+            return [doc[i].get_text() for i in range(page_count)]
+
+    # Buffers such as memoryview can't be pickled to the workers
+    data = bytes(data)
+    pool = _get_pool(workers)
+    futures = [
+        pool.submit(_extract_page_range, data, start, stop)
+        for start, stop in split_page_ranges(page_count, workers)
+    ]
+    pages = []
+    for future in futures:
+        pages.extend(future.result())
+    return pages
+
+def extract_pdf_text(data, max_pages=DEFAULT_MAX_PAGES, workers=1):
+    """Extract the text of an in-memory PDF as a single string"""
+    return "".join(extract_pdf_pages(data, max_pages=max_pages, workers=workers))
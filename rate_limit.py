@@ -0,0 +1,167 @@
+# rate_limit.py - Request budget and in-flight request coalescing for the job API
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+
+DEFAULT_BUDGET_PATH = "job_api_budget.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_bucket (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_usage (
+    day TEXT NOT NULL,
+    name TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, name)
+);
+"""
+
+class BudgetError(Exception):
+    """Base class for requests refused by a RequestBudget"""
+
+class DailyBudgetExhausted(BudgetError):
+    """The daily call budget is used up"""
+
+class RateLimitTimeout(BudgetError):
+    """No token became available before the timeout"""
+
+def _today():
+    return datetime.now(timezone.utc).date().isoformat()
+
+class RequestBudget:
+    """
+    Token bucket plus daily call budget shared by every process using the same file
+
+    Each acquire() takes one token (refilled at rate_per_second up to burst)
+    and counts one call against daily_limit. The check-and-take runs inside
+    a SQLite BEGIN IMMEDIATE transaction, which serializes it across
+    processes.
+    """
+
+    def __init__(self, path=DEFAULT_BUDGET_PATH, name="adzuna", rate_per_second=25 / 60,
+                 burst=5, daily_limit=100):
+        self.path = path
+        self.name = name
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.daily_limit = daily_limit
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.isolation_level = None  # explicit BEGIN/COMMIT below
+        return conn
+
+    def _try_acquire(self, reserve=0):
+        """Take a token if possible. Returns 0 on success or the seconds to wait."""
+        now = time.time()
+        day = _today()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT calls FROM daily_usage WHERE day = ? AND name = ?", (day, self.name)
+                ).fetchone()
+                if self.daily_limit is not None and row and row[0] >= self.daily_limit - reserve:
+                    raise DailyBudgetExhausted(
+                        f"Daily budget of {self.daily_limit} {self.name} calls used up"
+                        + (f" (keeping {reserve} in reserve)" if reserve else "")
+                    )
+
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM token_bucket WHERE name = ?", (self.name,)
+                ).fetchone()
+                tokens = self.burst if row is None else min(self.burst, row[0] + (now - row[1]) * self.rate_per_second)
+
+                if tokens >= 1:
+                    tokens -= 1
+                    wait = 0.0
+                    conn.execute(
+                        "INSERT INTO daily_usage (day, name, calls) VALUES (?, ?, 1) "
+                        "ON CONFLICT(day, name) DO UPDATE SET calls = calls + 1",
+                        (day, self.name)
+                    )
+                else:
+                    wait = (1 - tokens) / self.rate_per_second
+                conn.execute(
+                    "INSERT INTO token_bucket (name, tokens, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                    (self.name, tokens, now)
+                )
+                conn.execute("COMMIT")
+                return wait
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def acquire(self, timeout=30.0, reserve=0):
+        """
+        Block until a call is allowed, raising a BudgetError if it can't be within timeout
+
+        timeout=None waits for a token however long it takes. reserve leaves
+        that many of the day's calls to other callers, so background jobs
+        can't use up the budget interactive requests depend on.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._try_acquire(reserve)
+            if wait == 0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitTimeout(f"{self.name} rate limit: no request slot within {timeout:.0f}s")
+            time.sleep(wait)
+
+    def usage(self):
+        """Return today's call count and limit"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT calls FROM daily_usage WHERE day = ? AND name = ?", (_today(), self.name)
+            ).fetchone()
+        return {"calls_today": row[0] if row else 0, "daily_limit": self.daily_limit}
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls: the first caller for a key runs the
+    function and everyone arriving while it runs gets the same result
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
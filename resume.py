@@ -1,10 +1,13 @@
+import argparse
 import pandas as pd
 import numpy as np
 import random
 from faker import Faker
 import json
+import os
 from datetime import datetime, timedelta
 import re
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
 
 # Initialize Faker with Indian context
@@ -512,14 +515,14 @@ def complete_career_objectives():
 complete_career_objectives()
 
 # Function to generate a realistic career timeline with better experience distribution
-def generate_career_timeline(category, experience_years, start_date=None):
-    """Generate a realistic work history based on total years of experience"""
+def generate_career_timeline(category, experience_years, start_date=None, as_of=None):
+    """Generate a realistic work history based on total years of experience, up to as_of (default now)"""
+    current_date = as_of or datetime.now()
     if not start_date:
         # Start date is graduation date, roughly experience_years + few years ago from now
         total_years_ago = experience_years + random.randint(0, 3)  # Add some variability
-        start_date = datetime.now() - timedelta(days=365 * total_years_ago)
-       
-    current_date = datetime.now()
+        start_date = current_date - timedelta(days=365 * total_years_ago)
+
     career = []
     remaining_years = experience_years
    
@@ -594,7 +597,7 @@ def generate_career_timeline(category, experience_years, start_date=None):
     return career
 
 # Enhanced function to generate education background
-def generate_education(category, experience_years):
+def generate_education(category, experience_years, as_of=None):
     """Generate educational background appropriate for the role with better distribution"""
    
     # Determine highest degree based on experience, category and probability
@@ -666,7 +669,7 @@ def generate_education(category, experience_years):
     university = random.choice(university_pool)
    
     # Calculate graduation year based on experience
-    current_year = datetime.now().year
+    current_year = (as_of or datetime.now()).year
     years_since_highest_degree = experience_years + random.randint(0, 2)
     graduation_year = current_year - years_since_highest_degree
    
@@ -709,7 +712,9 @@ def generate_education(category, experience_years):
         twelfth_year = graduation_year - 4 if degree_level == "Bachelor's" else education[-1]["year"] - 4
         tenth_year = twelfth_year - 2
        
-        school_name = f"{random.choice(['DAV', 'DPS', 'Kendriya Vidyalaya', 'St. Xavier\'s', 'Modern School', 'Delhi Public School', 'Army Public School'])} {random.choice(['Public School', 'Higher Secondary School', 'Senior Secondary School'])}"
+        # Chosen outside the f-string - a backslash escape isn't allowed inside its braces before Python 3.12
+        school_prefix = random.choice(['DAV', 'DPS', 'Kendriya Vidyalaya', "St. Xavier's", 'Modern School', 'Delhi Public School', 'Army Public School'])
+        school_name = f"{school_prefix} {random.choice(['Public School', 'Higher Secondary School', 'Senior Secondary School'])}"
        
         education.append({
             "degree": f"Class XII ({school_board})",
@@ -1021,7 +1026,7 @@ INDIAN_CERTIFICATIONS = {
 }
 
 # Function to generate certifications with better distribution
-def generate_certifications(category, experience_years):
+def generate_certifications(category, experience_years, as_of=None):
     """Generate relevant certifications based on job category and experience"""
    
     # Number of certifications based on experience - adjusted for better distribution
@@ -1053,13 +1058,14 @@ def generate_certifications(category, experience_years):
         if not category_certs:
             category_certs = general_certs
         else:
-            category_certs.extend(general_certs)
+            # New list - extending in place would grow INDIAN_CERTIFICATIONS on every call
+            category_certs = category_certs + general_certs
    
     # Select random certifications
     certifications = []
     if max_certs > 0:
         selected_certs = random.sample(category_certs, min(max_certs, len(category_certs)))
-        current_year = datetime.now().year
+        current_year = (as_of or datetime.now()).year
        
         for cert in selected_certs:
             # More realistic certification timing
@@ -1377,39 +1383,46 @@ def generate_languages():
         "programming": prog_languages
     }
 
+# Category weights for random draws, in TECH_CATEGORIES order
+# Adjusted weights to ensure more representation for underrepresented categories
+CATEGORY_WEIGHTS = [
+    12,  # Software Development
+    10,  # Data Science
+    9,   # Machine Learning Engineering
+    10,  # Full Stack Development
+    9,   # DevOps Engineering (increased)
+    8,   # Cloud Architecture (increased)
+    8,   # Frontend Development
+    8,   # Backend Development
+    8,   # Mobile App Development
+    7,   # UI/UX Design
+    7,   # QA & Testing
+    7,   # Cybersecurity
+    7,   # Database Administration (increased)
+    6,   # Product Management
+    6,   # Business Intelligence
+    5,   # ERP/SAP Consultant
+    5,   # Technical Support
+    5,   # Systems Administration
+    5,   # Network Engineering
+    6,   # IT Project Management
+    7,   # Data Engineering (new)
+    5,   # IoT Development (new)
+    5    # Embedded Systems (new)
+]
+
 # Function to generate a realistic resume with enhanced balancing
-def generate_resume(id):
-    """Generate a single synthetic resume with Indian tech industry focus"""
-   
-    # Select random category using a more balanced distribution
-    # Adjusted weights to ensure more representation for underrepresented categories
-    weights = [
-        12,  # Software Development
-        10,  # Data Science
-        9,   # Machine Learning Engineering
-        10,  # Full Stack Development
-        9,   # DevOps Engineering (increased)
-        8,   # Cloud Architecture (increased)
-        8,   # Frontend Development
-        8,   # Backend Development
-        8,   # Mobile App Development
-        7,   # UI/UX Design
-        7,   # QA & Testing
-        7,   # Cybersecurity
-        7,   # Database Administration (increased)
-        6,   # Product Management
-        6,   # Business Intelligence
-        5,   # ERP/SAP Consultant
-        5,   # Technical Support
-        5,   # Systems Administration
-        5,   # Network Engineering
-        6,   # IT Project Management
-        7,   # Data Engineering (new)
-        5,   # IoT Development (new)
-        5    # Embedded Systems (new)
-    ]
-    
-    category = random.choices(TECH_CATEGORIES, weights=weights, k=1)[0]
+def generate_resume(id, category=None, as_of=None):
+    """
+    Generate a single synthetic resume with Indian tech industry focus, optionally for a given category
+
+    Every date in the resume is relative to as_of (default: now).
+    """
+    as_of = as_of or datetime.now()
+   
+    # Select random category using a more balanced distribution, unless the caller planned it
+    if category is None:
+        category = random.choices(TECH_CATEGORIES, weights=CATEGORY_WEIGHTS, k=1)[0]
    
     # Determine experience level with a better distribution
     # Modified to have more mid-level candidates (5-8 years) which was underrepresented
@@ -1451,7 +1464,7 @@ def generate_resume(id):
     general_skills = ["Git", "GitHub", "Agile", "Scrum", "JIRA", "Communication", "Problem Solving", "Team Collaboration", "English Proficiency"]
     normalized_general = [normalize_skill_name(skill) for skill in general_skills]
     skills.extend(random.sample(normalized_general, random.randint(2, 5)))
-    skills = list(set(skills))  # Remove duplicates
+    skills = list(dict.fromkeys(skills))  # Remove duplicates, keeping order so runs are reproducible
    
     # Generate name with Indian context - better geographical distribution
     indian_first_names = [
@@ -1495,16 +1508,16 @@ def generate_resume(id):
     objective = objective.replace("{experience}", str(experience_years))
    
     # Generate career timeline
-    career = generate_career_timeline(category, experience_years)
+    career = generate_career_timeline(category, experience_years, as_of=as_of)
    
     # Generate education
-    education = generate_education(category, experience_years)
+    education = generate_education(category, experience_years, as_of=as_of)
    
     # Generate projects
     projects = generate_projects(category, skills, experience_years)
    
     # Generate certifications
-    certifications = generate_certifications(category, experience_years)
+    certifications = generate_certifications(category, experience_years, as_of=as_of)
    
     # Generate key achievements
     achievements = generate_key_achievements(category, experience_years)
@@ -1543,6 +1556,28 @@ def generate_resume(id):
     # LinkedIn URL
     linkedin = f"linkedin.com/in/{first_name.lower()}-{last_name.lower()}-{random.randint(10000, 99999)}"
    
+    # Build the repeated sections first (in the same order, so random draws are unchanged);
+    # nesting these f-strings inside the one below needs Python 3.12+
+    experience_section = ''.join(
+        f"\n{job['title']} at {job['company']}\n"
+        f"{job['start_date']} to {job['end_date']} ({job['duration']})\n"
+        f"- {'Led and mentored a team of junior developers, improving team productivity by 20%' if random.random() > 0.7 and not job.get('is_internship', False) else 'Collaborated with cross-functional teams to deliver high-quality solutions'}\n"
+        f"- {'Developed and maintained scalable applications using ' + ', '.join(random.sample(skills, min(3, len(skills))))}\n"
+        f"- {'Implemented best practices and optimized processes for greater efficiency' if random.random() > 0.5 else 'Participated in code reviews and ensured code quality standards were met'}\n"
+        for job in career
+    )
+    education_section = ''.join(f"\n{edu['degree']} - {edu['university']} ({edu['year']})\n" for edu in education)
+    projects_section = ''.join(
+        f"\n{project['name']}\nTechnologies: {', '.join(project['tech'])}\n{project['description']}\n"
+        for project in projects
+    )
+    certifications_section = "" if not certifications else "CERTIFICATIONS:\n" + ''.join(
+        f"{cert['name']} - {cert['issuer']} ({cert['year']})\n" for cert in certifications
+    )
+    achievements_section = "" if not achievements else "KEY ACHIEVEMENTS:\n" + ''.join(
+        f"• {achievement}\n" for achievement in achievements
+    )
+   
     # Generate resume text content
     resume_content = f"""
 {name}
@@ -1555,39 +1590,17 @@ SKILLS:
 {', '.join(skills)}
 
 EXPERIENCE:
-{
-    ''.join(f"""
-{job['title']} at {job['company']}
-{job['start_date']} to {job['end_date']} ({job['duration']})
-- {'Led and mentored a team of junior developers, improving team productivity by 20%' if random.random() > 0.7 and not job.get('is_internship', False) else 'Collaborated with cross-functional teams to deliver high-quality solutions'}
-- {'Developed and maintained scalable applications using ' + ', '.join(random.sample(skills, min(3, len(skills))))}
-- {'Implemented best practices and optimized processes for greater efficiency' if random.random() > 0.5 else 'Participated in code reviews and ensured code quality standards were met'}
-""" for job in career)
-}
+{experience_section}
 
 EDUCATION:
-{
-    ''.join(f"""
-{edu['degree']} - {edu['university']} ({edu['year']})
-""" for edu in education)
-}
+{education_section}
 
 PROJECTS:
-{
-    ''.join(f"""
-{project['name']}
-Technologies: {', '.join(project['tech'])}
-{project['description']}
-""" for project in projects)
-}
+{projects_section}
 
-{
-    "" if not certifications else "CERTIFICATIONS:\n" + ''.join(f"{cert['name']} - {cert['issuer']} ({cert['year']})\n" for cert in certifications)
-}
+{certifications_section}
 
-{
-    "" if not achievements else "KEY ACHIEVEMENTS:\n" + ''.join(f"• {achievement}\n" for achievement in achievements)
-}
+{achievements_section}
 
 LANGUAGES:
 Programming: {', '.join(languages['programming'])}
@@ -1623,8 +1636,9 @@ Spoken: {', '.join(languages['spoken'])}
         "languages_programming": languages["programming"],
         "projects": [p["name"] for p in projects],
         "key_achievements": achievements,
-        "submission_date": f"{fake.date_between(start_date='-1y', end_date='today')} {fake.time()}",
-        "last_updated": f"{fake.date_between(start_date='-6m', end_date='today')} {fake.time()}",
+        # The ranges Faker reads '-1y' and '-6m' (minutes, not months) as, anchored to as_of
+        "submission_date": f"{fake.date_between(start_date=as_of.date() - timedelta(days=365.24), end_date=as_of.date())} {fake.time(end_datetime=as_of)}",
+        "last_updated": f"{fake.date_between(start_date=as_of.date() - timedelta(minutes=6), end_date=as_of.date())} {fake.time(end_datetime=as_of)}",
         "is_synthetic": True,
         "source": "synthetic_indian_tech"
     }
@@ -1680,8 +1694,8 @@ def extract_keywords(text, category):
     
     keywords.extend(tech_terms)
    
-    # Remove duplicates and return
-    return list(set(keywords))
+    # Remove duplicates (keeping first-seen order) and return
+    return list(dict.fromkeys(keywords))
 
 def determine_domain(career, category):
     """Determine industry domain based on career and category - enhanced for better domain determination"""
@@ -1811,132 +1825,415 @@ def determine_domain(career, category):
     return most_common[0][0]
 
 # Function to generate multiple resumes and save to CSV with better balance
-def generate_resume_dataset(num_resumes=10000, output_file="synthetic_indian_tech_resumes.csv"):
-    """Generate a dataset of synthetic tech resumes with Indian context and improved balance"""
-   
-    print(f"Generating {num_resumes} synthetic Indian tech resumes with enhanced balance...")
-    resumes = []
-   
-    # Track categories to ensure better balance
-    category_counts = {category: 0 for category in TECH_CATEGORIES}
-    experience_distribution = {
-        "entry": 0,      # 0-2 years
-        "junior": 0,     # 3-5 years
-        "mid": 0,        # 6-8 years
-        "senior": 0,     # 9-12 years
-        "lead": 0        # 13+ years
-    }
-    
-    location_regions = {
-        "north": 0,
-        "south": 0,
-        "east": 0,
-        "west": 0,
-        "northeast": 0,
-        "central": 0
-    }
-   
-    for i in tqdm(range(num_resumes), desc="Generating Resumes"):
+# Columns written for every resume, in file order
+OUTPUT_COLUMNS = [
+    "candidate_id", "name", "location", "Category", "Resume", "skills", "experience_years",
+    "job_titles", "companies", "education_degree", "education_institution", "match_score",
+    "domain", "keywords", "certifications", "languages_spoken", "languages_programming",
+    "is_synthetic"
+]
+
+# List-valued fields are stored as JSON strings
+JSON_COLUMNS = {
+    "skills", "job_titles", "companies", "keywords", "certifications",
+    "languages_spoken", "languages_programming"
+}
+
+def resume_to_row(resume):
+    """Flatten a resume dictionary into one output row"""
+    row = {}
+    for column in OUTPUT_COLUMNS:
+        if column == "is_synthetic":
+            row[column] = True
+        elif column in JSON_COLUMNS:
+            row[column] = json.dumps(resume[column])
+        else:
+            row[column] = resume[column]
+    return row
+
+def experience_level(exp_years):
+    """Bucket years of experience into entry/junior/mid/senior/lead"""
+    if exp_years <= 2:
+        return "entry"
+    elif exp_years <= 5:
+        return "junior"
+    elif exp_years <= 8:
+        return "mid"
+    elif exp_years <= 12:
+        return "senior"
+    return "lead"
+
+def location_region(location):
+    """Map a resume location to a region of India"""
+    if any(city in location for city in ["Delhi", "Chandigarh", "Jaipur", "Lucknow"]):
+        return "north"
+    elif any(city in location for city in ["Mumbai", "Pune", "Ahmedabad", "Surat"]):
+        return "west"
+    elif any(city in location for city in ["Bangalore", "Chennai", "Hyderabad", "Kochi"]):
+        return "south"
+    elif any(city in location for city in ["Kolkata", "Bhubaneswar"]):
+        return "east"
+    elif any(city in location for city in ["Guwahati", "Shillong", "Imphal", "Agartala"]):
+        return "northeast"
+    return "central"
+
+class DatasetStats:
+    """Running category, experience and location statistics, updated one resume at a time"""
+
+    def __init__(self):
+        self.total = 0
+        self.category_counts = {category: 0 for category in TECH_CATEGORIES}
+        self.experience_distribution = {
+            "entry": 0,      # 0-2 years
+            "junior": 0,     # 3-5 years
+            "mid": 0,        # 6-8 years
+            "senior": 0,     # 9-12 years
+            "lead": 0        # 13+ years
+        }
+        self.location_regions = {
+            "north": 0,
+            "south": 0,
+            "east": 0,
+            "west": 0,
+            "northeast": 0,
+            "central": 0
+        }
+        # Experience is a small integer, so a histogram gives the exact median
+        self.experience_years = {}
+
+    def add(self, resume):
+        self.total += 1
+        self.category_counts[resume["Category"]] = self.category_counts.get(resume["Category"], 0) + 1
+        exp_years = resume["experience_years"]
+        self.experience_distribution[experience_level(exp_years)] += 1
+        self.location_regions[location_region(resume["location"])] += 1
+        self.experience_years[exp_years] = self.experience_years.get(exp_years, 0) + 1
+
+    def _median_experience(self):
+        middle = [(self.total - 1) // 2, self.total // 2]
+        values, seen = [], 0
+        for years, count in sorted(self.experience_years.items()):
+            while middle and middle[0] < seen + count:
+                values.append(years)
+                middle.pop(0)
+            seen += count
+        return sum(values) / 2
+
+    def experience_stats(self):
+        if not self.total:
+            return {"min": None, "max": None, "mean": None, "median": None}
+        return {
+            "min": min(self.experience_years),
+            "max": max(self.experience_years),
+            "mean": sum(years * count for years, count in self.experience_years.items()) / self.total,
+            "median": self._median_experience()
+        }
+
+    def summary(self, file_path=None):
+        """Return the statistics dictionary reported by generate_resume_dataset"""
+        return {
+            "total_resumes": self.total,
+            # Most common first, like pandas value_counts
+            "category_distribution": dict(sorted(
+                ((category, count) for category, count in self.category_counts.items() if count),
+                key=lambda item: item[1], reverse=True
+            )),
+            "experience_stats": self.experience_stats(),
+            "experience_distribution": dict(self.experience_distribution),
+            "location_distribution": dict(self.location_regions),
+            "file_path": file_path
+        }
+
+BALANCING_MODES = ("rejection", "stratified")
+
+def allocate_category_quotas(num_resumes, weights=None):
+    """
+    Split num_resumes into exact per-category counts
+
+    Counts are proportional to weights (equal by default), rounded with the
+    largest-remainder method so they always sum to num_resumes. Ties for the
+    leftover resumes go to categories earlier in TECH_CATEGORIES.
+    """
+    weights = weights or [1] * len(TECH_CATEGORIES)
+    total_weight = sum(weights)
+    exact = [num_resumes * weight / total_weight for weight in weights]
+    quotas = [int(share) for share in exact]
+    leftover = num_resumes - sum(quotas)
+    by_remainder = sorted(range(len(exact)), key=lambda i: (-(exact[i] - quotas[i]), i))
+    for i in by_remainder[:leftover]:
+        quotas[i] += 1
+    return dict(zip(TECH_CATEGORIES, quotas))
+
+def stratified_categories(num_resumes, rng=random):
+    """Every candidate's category, with exact equal quotas, in an order shuffled by rng"""
+    categories = [
+        category
+        for category, quota in allocate_category_quotas(num_resumes).items()
+        for _ in range(quota)
+    ]
+    rng.shuffle(categories)
+    return categories
+
+def iter_resumes(num_resumes, stats=None, balancing="rejection", as_of=None):
+    """
+    Yield num_resumes balanced resumes one at a time
+
+    stats (a DatasetStats) is updated as each resume is yielded; it also
+    drives the category balancing, so pass one in to read the totals after.
+
+    balancing="rejection" regenerates resumes of over-represented categories
+    (up to 3 times each) once 20% are done. "stratified" fixes exact
+    per-category quotas up front and generates each resume for its assigned
+    category, so nothing is generated twice.
+
+    Dates are relative to as_of, or to now when it isn't given.
+    """
+    if balancing not in BALANCING_MODES:
+        raise ValueError(f"Unknown balancing mode: {balancing}")
+    stats = stats if stats is not None else DatasetStats()
+    category_counts = stats.category_counts
+   
+    if balancing == "stratified":
+        for i, category in enumerate(stratified_categories(num_resumes)):
+            resume = generate_resume(i + 1, category=category, as_of=as_of)
+            stats.add(resume)
+            yield resume
+        return
+   
+    for i in range(num_resumes):
         # Use adaptive generation to ensure balance
         if i > num_resumes * 0.2:  # After 20% of generation, start balancing
             # Find underrepresented categories
             min_category = min(category_counts, key=category_counts.get)
             
             # Generate resume with guidance toward underrepresented areas
-            resume = generate_resume(i + 1)
+            resume = generate_resume(i + 1, as_of=as_of)
             
             # If we need to balance categories and this isn't helping, regenerate
             attempts = 0
             while attempts < 3 and category_counts[resume["Category"]] > category_counts[min_category] * 1.5:
-                resume = generate_resume(i + 1)
+                resume = generate_resume(i + 1, as_of=as_of)
                 attempts += 1
         else:
             # For first 20%, generate normally to assess natural distribution
-            resume = generate_resume(i + 1)
+            resume = generate_resume(i + 1, as_of=as_of)
         
-        # Update tracking counts
-        category_counts[resume["Category"]] += 1
-        
-        # Track experience distribution
-        exp_years = resume["experience_years"]
-        if exp_years <= 2:
-            experience_distribution["entry"] += 1
-        elif exp_years <= 5:
-            experience_distribution["junior"] += 1
-        elif exp_years <= 8:
-            experience_distribution["mid"] += 1
-        elif exp_years <= 12:
-            experience_distribution["senior"] += 1
-        else:
-            experience_distribution["lead"] += 1
-            
-        # Track location distribution
-        location = resume["location"]
-        if any(city in location for city in ["Delhi", "Chandigarh", "Jaipur", "Lucknow"]):
-            location_regions["north"] += 1
-        elif any(city in location for city in ["Mumbai", "Pune", "Ahmedabad", "Surat"]):
-            location_regions["west"] += 1
-        elif any(city in location for city in ["Bangalore", "Chennai", "Hyderabad", "Kochi"]):
-            location_regions["south"] += 1
-        elif any(city in location for city in ["Kolkata", "Bhubaneswar"]):
-            location_regions["east"] += 1
-        elif any(city in location for city in ["Guwahati", "Shillong", "Imphal", "Agartala"]):
-            location_regions["northeast"] += 1
-        else:
-            location_regions["central"] += 1
-            
-        resumes.append(resume)
-   
-    # Convert to DataFrame
-    print("Converting to DataFrame...")
-    resume_df = pd.DataFrame()
-    resume_df["candidate_id"] = [r["candidate_id"] for r in resumes]
-    resume_df["name"] = [r["name"] for r in resumes]
-    resume_df["location"] = [r["location"] for r in resumes]
-    resume_df["Category"] = [r["Category"] for r in resumes]
-    resume_df["Resume"] = [r["Resume"] for r in resumes]
-    resume_df["skills"] = [json.dumps(r["skills"]) for r in resumes]
-    resume_df["experience_years"] = [r["experience_years"] for r in resumes]
-    resume_df["job_titles"] = [json.dumps(r["job_titles"]) for r in resumes]
-    resume_df["companies"] = [json.dumps(r["companies"]) for r in resumes]
-    resume_df["education_degree"] = [r["education_degree"] for r in resumes]
-    resume_df["education_institution"] = [r["education_institution"] for r in resumes]
-    resume_df["match_score"] = [r["match_score"] for r in resumes]
-    resume_df["domain"] = [r["domain"] for r in resumes]
-    resume_df["keywords"] = [json.dumps(r["keywords"]) for r in resumes]
-    resume_df["certifications"] = [json.dumps(r["certifications"]) for r in resumes]
-    resume_df["languages_spoken"] = [json.dumps(r["languages_spoken"]) for r in resumes]
-    resume_df["languages_programming"] = [json.dumps(r["languages_programming"]) for r in resumes]
-    resume_df["is_synthetic"] = True
-   
-    # Save to CSV
-    print(f"Saving dataset to {output_file}...")
-    resume_df.to_csv(output_file, index=False)
-    print(f"Successfully generated {num_resumes} synthetic Indian tech resumes and saved to {output_file}")
+        stats.add(resume)
+        yield resume
+
+# Candidates per shard. Fixed, so seeds and output don't depend on the worker count.
+SHARD_SIZE = 250
+
+# Reference date for sharded generation unless one is passed, so a seed gives the same file on any day
+DEFAULT_AS_OF = datetime(2026, 1, 1)
+
+def plan_categories(num_resumes, seed, balancing="rejection"):
+    """
+    Pick every candidate's category up front, balanced the same way as iter_resumes
+
+    For rejection balancing only the category draws are replayed (with their
+    own RNG), so the global balance is decided before any resume is generated
+    and shards can then be generated independently.
+    """
+    if balancing not in BALANCING_MODES:
+        raise ValueError(f"Unknown balancing mode: {balancing}")
+    rng = random.Random(seed)
+    if balancing == "stratified":
+        return stratified_categories(num_resumes, rng)
+    category_counts = {category: 0 for category in TECH_CATEGORIES}
+    plan = []
+    for i in range(num_resumes):
+        category = rng.choices(TECH_CATEGORIES, weights=CATEGORY_WEIGHTS, k=1)[0]
+        if i > num_resumes * 0.2:  # After 20% of generation, start balancing
+            min_category = min(category_counts, key=category_counts.get)
+            attempts = 0
+            while attempts < 3 and category_counts[category] > category_counts[min_category] * 1.5:
+                category = rng.choices(TECH_CATEGORIES, weights=CATEGORY_WEIGHTS, k=1)[0]
+                attempts += 1
+        category_counts[category] += 1
+        plan.append(category)
+    return plan
+
+def seed_shard(master_seed, shard_index):
+    """Reseed random, the shared Faker instance and numpy from (master_seed, shard_index)"""
+    seed = int(np.random.SeedSequence([master_seed, shard_index]).generate_state(1)[0])
+    random.seed(seed)
+    fake.seed_instance(seed)
+    np.random.seed(seed)
+
+# Worker: generate one shard of candidates as output rows
+def generate_shard(master_seed, shard_index, first_id, categories, as_of=DEFAULT_AS_OF):
+    seed_shard(master_seed, shard_index)
+    return [
+        resume_to_row(generate_resume(first_id + offset, category=category, as_of=as_of))
+        for offset, category in enumerate(categories)
+    ]
+
+def iter_resume_rows_sharded(num_resumes, seed=42, workers=None, shard_size=SHARD_SIZE, balancing="rejection",
+                             as_of=None):
+    """
+    Yield output rows for num_resumes candidates generated shard by shard
+
+    Shards run on a process pool (in-process when workers is 1) and are
+    yielded in candidate order, with a bounded number in flight. Dates in the
+    resumes are relative to as_of (default DEFAULT_AS_OF), so for a given seed
+    and as_of the rows are the same whatever the worker count or the day.
+    """
+    as_of = as_of or DEFAULT_AS_OF
+    categories = plan_categories(num_resumes, seed, balancing)
+    shards = [
+        (seed, index, start + 1, categories[start:start + shard_size], as_of)
+        for index, start in enumerate(range(0, num_resumes, shard_size))
+    ]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for shard in shards:
+            yield from generate_shard(*shard)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for shard in shards:
+            pending.append(pool.submit(generate_shard, *shard))
+            if len(pending) >= workers * 2:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
+
+class CsvChunkWriter:
+    """Append row chunks to a CSV file, writing the header once"""
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.header_written = False
+
+    def write(self, rows):
+        pd.DataFrame(rows, columns=OUTPUT_COLUMNS).to_csv(
+            self.output_file, mode="a" if self.header_written else "w",
+            header=not self.header_written, index=False
+        )
+        self.header_written = True
+
+    def close(self):
+        if not self.header_written:
+            pd.DataFrame(columns=OUTPUT_COLUMNS).to_csv(self.output_file, index=False)
+
+class ParquetChunkWriter:
+    """Write row chunks as row groups of one Parquet file (needs pyarrow)"""
+
+    def __init__(self, output_file):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        types = {"experience_years": pa.int64(), "match_score": pa.float64(), "is_synthetic": pa.bool_()}
+        self.schema = pa.schema([(column, types.get(column, pa.string())) for column in OUTPUT_COLUMNS])
+        self.writer = pq.ParquetWriter(output_file, self.schema)
+
+    def write(self, rows):
+        columns = {column: [row[column] for row in rows] for column in OUTPUT_COLUMNS}
+        self.writer.write_table(self.pa.Table.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+def open_chunk_writer(output_file, output_format=None):
+    """Return a CSV or Parquet chunk writer, picking the format from the file extension by default"""
+    output_format = output_format or ("parquet" if output_file.endswith(".parquet") else "csv")
+    if output_format == "parquet":
+        return ParquetChunkWriter(output_file)
+    if output_format == "csv":
+        return CsvChunkWriter(output_file)
+    raise ValueError(f"Unknown output format: {output_format}")
+
+def write_resumes(resumes, output_file, chunk_size=1000, output_format=None):
+    """Stream resumes to disk chunk_size rows at a time. Returns the number written."""
+    return write_rows(map(resume_to_row, resumes), output_file, chunk_size, output_format)
+
+def write_rows(rows, output_file, chunk_size=1000, output_format=None):
+    """Stream rows from resume_to_row to disk chunk_size at a time. Returns the number written."""
+    writer = open_chunk_writer(output_file, output_format)
+    written, chunk = 0, []
+    try:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                writer.write(chunk)
+                written += len(chunk)
+                chunk = []
+        if chunk:
+            writer.write(chunk)
+            written += len(chunk)
+    finally:
+        writer.close()
+    return written
+
+def generate_resume_dataset(num_resumes=10000, output_file="synthetic_indian_tech_resumes.csv",
+                            chunk_size=1000, output_format=None, workers=None, seed=None,
+                            balancing="rejection", as_of=None):
+    """
+    Generate a dataset of synthetic tech resumes with Indian context and improved balance
+
+    Resumes are streamed to output_file (CSV, or Parquet for a .parquet file
+    or output_format="parquet") chunk_size rows at a time, so memory stays
+    bounded however many are generated.
+
+    Passing workers or seed switches to sharded generation: categories are
+    planned globally, then shards are generated on a process pool, each
+    seeded from (seed, shard index), with dates relative to as_of (pinned to
+    DEFAULT_AS_OF unless given). The output for a seed is then identical for
+    any worker count and on any day. Unsharded runs date resumes from as_of
+    or, by default, now.
+
+    balancing is "rejection" (regenerate over-represented categories) or
+    "stratified" (exact equal category counts, no resume generated twice).
+    """
    
-    # Return statistics
-    category_counts = resume_df["Category"].value_counts().to_dict()
-    experience_stats = {
-        "min": resume_df["experience_years"].min(),
-        "max": resume_df["experience_years"].max(),
-        "mean": resume_df["experience_years"].mean(),
-        "median": resume_df["experience_years"].median()
-    }
+    print(f"Generating {num_resumes} synthetic Indian tech resumes with enhanced balance...")
+    stats = DatasetStats()
    
-    return {
-        "total_resumes": len(resume_df),
-        "category_distribution": category_counts,
-        "experience_stats": experience_stats,
-        "experience_distribution": experience_distribution,
-        "location_distribution": location_regions,
-        "file_path": output_file
-    }
+    if workers is None and seed is None:
+        resumes = iter_resumes(num_resumes, stats, balancing=balancing, as_of=as_of)
+        rows = map(resume_to_row, resumes)
+    else:
+        rows = iter_resume_rows_sharded(
+            num_resumes, seed=42 if seed is None else seed, workers=workers, balancing=balancing, as_of=as_of
+        )
+
+        def counted(rows):
+            for row in rows:
+                stats.add(row)
+                yield row
+        rows = counted(rows)
+   
+    print(f"Streaming dataset to {output_file}...")
+    write_rows(tqdm(rows, total=num_resumes, desc="Generating Resumes"), output_file,
+               chunk_size=chunk_size, output_format=output_format)
+    print(f"Successfully generated {num_resumes} synthetic Indian tech resumes and saved to {output_file}")
+   
+    return stats.summary(output_file)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Indian tech resume dataset")
+    parser.add_argument("--num-resumes", type=int, default=10000)
+    parser.add_argument("--output", default="enhanced_synthetic_indian_tech_resumes.csv", help=".csv or .parquet file")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows written per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Generate shards on this many processes")
+    parser.add_argument("--seed", type=int, default=None, help="Master seed for reproducible sharded generation")
+    parser.add_argument("--balancing", choices=["rejection", "stratified"], default="rejection",
+                        help="stratified gives exact equal category counts without regenerating resumes")
+    parser.add_argument("--as-of", type=datetime.fromisoformat, default=None,
+                        help="Reference date (YYYY-MM-DD) the resumes are dated from "
+                             f"(sharded runs default to {DEFAULT_AS_OF:%Y-%m-%d}, others to today)")
+    args = parser.parse_args()
+
     print("Starting enhanced synthetic Indian tech resume dataset generation...")
    
     # Generate resumes with increased count for better category coverage
-    resume_stats = generate_resume_dataset(num_resumes=10000, output_file="enhanced_synthetic_indian_tech_resumes.csv")
+    resume_stats = generate_resume_dataset(
+        num_resumes=args.num_resumes, output_file=args.output, chunk_size=args.chunk_size,
+        workers=args.workers, seed=args.seed, balancing=args.balancing, as_of=args.as_of
+    )
    
     # Print statistics
     print("\n--- Enhanced Dataset Generation Complete ---")
@@ -0,0 +1,103 @@
+# resume_cache.py - Content-addressed cache for extracted resume text and predictions
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+def hash_pdf_bytes(pdf_bytes):
+    """Return the SHA-256 hex digest identifying a PDF's content"""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+class ResumeCache:
+    """
+    LRU cache of extracted text (keyed on the PDF hash and page cap) and
+    classification results (keyed on those plus the model name and model
+    artifact version)
+
+    When cache_dir is set, every entry is also written there as a pickle so
+    later processes and restarts can reuse it.
+    """
+
+    def __init__(self, max_entries=256, cache_dir=None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, "-".join(key) + ".pkl")
+
+    def _get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = None
+        if self.cache_dir:
+            try:
+                with open(self._disk_path(key), "rb") as f:
+                    value = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value)
+        return value
+
+    def _put(self, key, value):
+        with self._lock:
+            self._store(key, value)
+        if self.cache_dir:
+            # Write to a temp file first so readers never see a partial pickle
+            path = self._disk_path(key)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, path)
+            except OSError:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # Text extracted with a page cap is only valid for that cap, and so are
+    # predictions made from it; max_pages=None means every page
+    @staticmethod
+    def _pages_key(max_pages):
+        return "all" if max_pages is None else f"p{max_pages}"
+
+    def get_text(self, pdf_hash, max_pages):
+        return self._get(("text", pdf_hash, self._pages_key(max_pages)))
+
+    def put_text(self, pdf_hash, max_pages, text):
+        self._put(("text", pdf_hash, self._pages_key(max_pages)), text)
+
+    # model_version (see ModelRegistry.artifact_version) keeps a retrained
+    # model saved under the same name from serving stale predictions
+    def get_result(self, pdf_hash, max_pages, model_name, model_version):
+        return self._get(("result", pdf_hash, self._pages_key(max_pages), model_name, model_version))
+
+    def put_result(self, pdf_hash, max_pages, model_name, model_version, result):
+        self._put(("result", pdf_hash, self._pages_key(max_pages), model_name, model_version), result)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
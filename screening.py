@@ -0,0 +1,253 @@
+# screening.py - UI-free resume screening core shared by the app, CLI and services
+#
+# Nothing here imports Streamlit: errors are raised, diagnostics go to the
+# "screening" logger and timings to the metrics hooks.
+import logging
+import os
+from functools import partial
+
+import numpy as np
+from scipy import sparse
+
+import metrics
+from batching import MicroBatcher
+from linear_scoring import get_linear_scorer
+from model_registry import LABEL_ENCODER_FILE, ModelRegistry
+from pdf_extract import DEFAULT_MAX_PAGES, extract_pdf_text
+from text_normalizer import clean_text
+
+logger = logging.getLogger(__name__)
+
+# Extract text from PDF bytes held in memory
+def extract_resume_text(data, max_pages=DEFAULT_MAX_PAGES, workers=1):
+    """Extract the text of an in-memory PDF, raising on unreadable files"""
+    with metrics.timed("screening.extract"):
+        return extract_pdf_text(data, max_pages=max_pages, workers=workers)
+
+# Scan a models directory into a lazily loading registry
+def load_model_registry(models_dir, max_loaded=4):
+    """
+    Return a ModelRegistry for models_dir
+
+    Raises:
+        FileNotFoundError: If the directory or the label encoder is missing
+    """
+    if not os.path.exists(models_dir):
+        raise FileNotFoundError(f"Models directory not found: {models_dir}")
+    
+    registry = ModelRegistry(models_dir, max_loaded=max_loaded)
+    
+    if LABEL_ENCODER_FILE not in registry:
+        raise FileNotFoundError(f"Label encoder not found at: {os.path.join(models_dir, LABEL_ENCODER_FILE)}")
+    
+    logger.info("Found %d models in %s", len(registry.model_files), models_dir,
+                extra={"models_dir": models_dir, "model_count": len(registry.model_files)})
+    return registry
+
+# Adjust feature dimensions if needed
+def adjust_feature_dimensions(features, expected_features):
+    if expected_features is None:
+        return features
+        
+    current_features = features.shape[1]
+    
+    if current_features == expected_features:
+        return features
+    
+    if current_features > expected_features:
+        return features[:, :expected_features]
+    else:
+        padding = sparse.csr_matrix((features.shape[0], expected_features - current_features))
+        return sparse.hstack([features, padding])
+
+# MODEL-VECTORIZER MAPPING - FALLBACK IF AUTO-DETECTION FAILS
+MODEL_INFO = {
+    'naive_bayes_model.pkl': {'vectorizer': 'tfidf_vectorizer.pkl', 'features': 3000, 'is_pipeline': False},
+    'linear_svm_model.pkl': {'vectorizer': 'tfidf_vectorizer.pkl', 'features': 661, 'is_pipeline': False},
+    'ensemble_model.pkl': {'vectorizer': 'tfidf_vectorizer.pkl', 'features': 661, 'is_pipeline': False},
+    'ensemble_pipeline.pkl': {'is_pipeline': True, 'text_input': 'raw'},  # Mark as a pipeline that takes raw text
+    'realistic_naive_bayes.pkl': {'vectorizer': 'bow_vectorizer.pkl', 'features': None, 'is_pipeline': False}
+}
+
+# Resolve the input spec for a model - auto-detected info first, then MODEL_INFO
+def get_model_specs(model_name, model_info):
+    """Return the vectorizer/feature/pipeline spec used to feed a model"""
+    if model_name in model_info:
+        model_specs = dict(model_info[model_name])
+    else:
+        model_specs = dict(MODEL_INFO.get(model_name, {
+            'vectorizer': 'tfidf_vectorizer.pkl',
+            'features': None,
+            'is_pipeline': False
+        }))
+    
+    # Special check for names containing "pipeline"
+    if 'pipeline' in model_name.lower():
+        model_specs['is_pipeline'] = True
+    
+    # Pipelines vectorize raw text themselves; other models get cleaned text
+    model_specs.setdefault('text_input', 'raw' if model_specs.get('is_pipeline', False) else 'clean')
+    
+    return model_specs
+
+# Map score columns to category names
+def get_column_categories(model, n_columns, categories):
+    """Return the category name for each column of a predict_proba/decision_function matrix"""
+    classes = getattr(model, 'classes_', None)
+    if classes is None or len(classes) != n_columns:
+        classes = range(n_columns)
+    return [cls if isinstance(cls, str) else categories[int(cls)] for cls in classes]
+
+# Select the top-k columns of every row without sorting the full matrix
+def top_k_columns(scores, k, tiebreak=None):
+    """
+    Return (indices, values) of the k highest scores per row, best first
+
+    Equal scores are ordered by tiebreak (e.g. raw decision scores) when
+    given, then by column, so the first column is the argmax predict() picks.
+    """
+    k = min(k, scores.shape[1])
+    if tiebreak is None:
+        order = np.argsort(-scores, axis=1, kind='stable')
+    else:
+        order = np.lexsort((-tiebreak, -scores), axis=1)
+    top_indices = order[:, :k]
+    return top_indices, np.take_along_axis(scores, top_indices, axis=1)
+
+# Function to classify a batch of resumes
+def classify_resumes(resume_texts, model, model_name, loaded_models, model_info, top_k=3):
+    """Classify many resumes with one vectorizer pass and one predict_proba pass
+
+    Args:
+        resume_texts: List of raw resume texts
+        model: Loaded model (pipeline or plain estimator)
+        model_name: File name of the model, used to look up its specs
+        loaded_models: Model registry returned by load_model_registry
+        model_info: Auto-detected model info (the registry's model_info)
+        top_k: Number of categories to return per resume
+
+    Returns:
+        List of (predicted_category, top_categories) tuples, one per resume
+    """
+    resume_texts = list(resume_texts)
+    if not resume_texts:
+        return []
+    
+    with metrics.timed("screening.classify", model=model_name):
+        results = _classify_batch(resume_texts, model, model_name, loaded_models, model_info, top_k)
+    metrics.increment("screening.resumes", len(results), model=model_name)
+    return results
+
+def _classify_batch(resume_texts, model, model_name, loaded_models, model_info, top_k):
+    categories = loaded_models['label_encoder'].classes_
+    model_specs = get_model_specs(model_name, model_info)
+    
+    # Decide once whether the model sees raw or cleaned text
+    if model_specs['text_input'] == 'clean':
+        texts = [clean_text(text) for text in resume_texts]
+    else:
+        texts = resume_texts
+    
+    if model_specs.get('is_pipeline', False):
+        # PIPELINE MODE: Pass text directly to the model
+        features = texts
+    else:
+        # STANDARD MODEL MODE: Vectorize the whole batch as one sparse matrix
+        vectorizer = loaded_models[model_specs.get('vectorizer', 'tfidf_vectorizer.pkl')]
+        features = vectorizer.transform(texts)
+        expected_features = model_specs.get('features', None)
+        if expected_features is not None:
+            features = adjust_feature_dimensions(features, expected_features)
+    
+    # Linear SVM / Naive Bayes models are scored with one precompiled sparse matmul
+    scorer = None if model_specs.get('is_pipeline', False) else get_linear_scorer(model)
+    
+    decision = None
+    if scorer is not None:
+        # Saturated probabilities (modified_huber) tie classes; the decision scores break the ties
+        scores, decision = scorer.scores(features, return_decision=True)
+        is_probability = scorer.is_probability
+    elif hasattr(model, 'predict_proba'):
+        scores = np.asarray(model.predict_proba(features), dtype=float)
+        is_probability = True
+    elif hasattr(model, 'decision_function'):
+        scores = np.asarray(model.decision_function(features), dtype=float)
+        is_probability = False
+    else:
+        # No scores available - fall back to hard predictions
+        predictions = model.predict(features)
+        labels = [p if isinstance(p, str) else categories[int(p)] for p in predictions]
+        return [(label, [(label, 1.0)]) for label in labels]
+    
+    if scores.ndim == 1:
+        # Binary decision_function returns a single column for the positive class
+        scores = np.column_stack([-scores, scores])
+    
+    column_categories = get_column_categories(model, scores.shape[1], categories)
+    top_indices, top_scores = top_k_columns(scores, top_k, tiebreak=decision)
+    
+    if not is_probability:
+        # Normalize decision scores to appear like probabilities
+        max_scores = np.abs(top_scores).max(axis=1, keepdims=True)
+        safe_max = np.where(max_scores > 0, max_scores, 1.0)
+        top_scores = np.where(max_scores > 0, (top_scores + max_scores) / (2 * safe_max), 1.0)
+    
+    results = []
+    for row_indices, row_scores in zip(top_indices, top_scores):
+        top_categories = [(column_categories[idx], float(score)) for idx, score in zip(row_indices, row_scores)]
+        results.append((top_categories[0][0], top_categories))
+    return results
+
+# Classify a single resume
+def classify_resume(resume_text, model, model_name, loaded_models, model_info, top_k=3):
+    """Classify one resume, returning (predicted_category, top_categories)"""
+    model_specs = get_model_specs(model_name, model_info)
+    logger.debug(
+        "Classifying with %s", model_name,
+        extra={
+            "model": model_name,
+            "is_pipeline": model_specs.get('is_pipeline', False),
+            "text_input": model_specs['text_input'],
+            "vectorizer": model_specs.get('vectorizer'),
+            "expected_features": model_specs.get('features'),
+        }
+    )
+    
+    # One scoring pass - the label is the argmax of the same scores used for the top 3
+    [(predicted_category, top_categories)] = classify_resumes(
+        [resume_text], model, model_name, loaded_models, model_info, top_k=top_k
+    )
+    return predicted_category, top_categories
+
+# Classify requests that may target different models in one batch
+def classify_requests(requests, registry):
+    """
+    Classify (text, model_name, top_k) requests, one classify_resumes call per (model_name, top_k)
+
+    Returns results in request order. A group that fails yields its exception
+    in place of each of its results, so other groups are unaffected.
+    """
+    groups = {}
+    for position, (_, model_name, top_k) in enumerate(requests):
+        groups.setdefault((model_name, top_k), []).append(position)
+    
+    results = [None] * len(requests)
+    for (model_name, top_k), positions in groups.items():
+        try:
+            group_results = classify_resumes(
+                [requests[i][0] for i in positions], registry[model_name], model_name,
+                registry, registry.model_info, top_k=top_k
+            )
+        except Exception as e:
+            logger.warning("Classification failed for %s: %s", model_name, e, extra={"model": model_name})
+            group_results = [e] * len(positions)
+        for position, result in zip(positions, group_results):
+            results[position] = result
+    return results
+
+def make_classification_batcher(registry, max_batch_size=32, max_wait_ms=5.0):
+    """Return a MicroBatcher whose items are (text, model_name, top_k) tuples"""
+    return MicroBatcher(
+        partial(classify_requests, registry=registry), max_batch_size=max_batch_size,
+        max_wait_ms=max_wait_ms, name="classify"
+    )
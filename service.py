@@ -0,0 +1,191 @@
+# service.py - REST API for resume classification and job matching
+#
+# Run with uvicorn; every worker process loads the models once at startup:
+#   python service.py --port 8000 --workers 4
+#   uvicorn service:app --port 8000 --workers 4
+#
+#   curl -X POST localhost:8000/classify -H 'Content-Type: application/json' -d '{"text": "..."}'
+#   curl -X POST localhost:8000/classify/pdf --data-binary @resume.pdf -H 'Content-Type: application/pdf'
+#   curl -X POST localhost:8000/jobs/recommend -H 'Content-Type: application/json' -d '{"text": "...", "location": "India"}'
+#   curl localhost:8000/metrics
+import argparse
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from pydantic import BaseModel, Field
+
+import metrics
+from batching import MicroBatcher
+from jobsearch import find_jobs, get_adzuna_credentials, score_jobs_relevance
+from pdf_extract import DEFAULT_MAX_PAGES
+from screening import extract_resume_text, load_model_registry, make_classification_batcher
+
+logger = logging.getLogger(__name__)
+
+MODELS_DIR = os.environ.get("MODELS_DIR", "./models")
+DEFAULT_MODEL = os.environ.get("SERVICE_DEFAULT_MODEL", "ensemble_pipeline.pkl")
+MAX_PDF_BYTES = int(os.environ.get("SERVICE_MAX_PDF_BYTES", str(10 * 1024 * 1024)))
+
+# Micro-batching knobs: a batch runs when it is full or its oldest request has waited this long
+BATCH_MAX_SIZE = int(os.environ.get("BATCH_MAX_SIZE", "32"))
+BATCH_MAX_WAIT_MS = float(os.environ.get("BATCH_MAX_WAIT_MS", "5"))
+
+# Above 0, batches are split across this many forked processes sharing the models (see inference_pool.py)
+INFERENCE_WORKERS = int(os.environ.get("INFERENCE_WORKERS", "0"))
+
+class ClassifyRequest(BaseModel):
+    text: str = Field(..., min_length=1)
+    model: Optional[str] = None
+    top_k: int = Field(3, ge=1, le=25)
+
+class CategoryScore(BaseModel):
+    category: str
+    score: float
+
+class ClassifyResponse(BaseModel):
+    model: str
+    predicted_category: str
+    confidence: float
+    top_categories: List[CategoryScore]
+    chars: int
+
+class RecommendRequest(BaseModel):
+    text: Optional[str] = None
+    category: Optional[str] = None
+    location: str = "Remote"
+    num_jobs: int = Field(5, ge=1, le=50)
+    model: Optional[str] = None
+
+@asynccontextmanager
+async def lifespan(app):
+    # Runs once per worker process
+    registry = load_model_registry(MODELS_DIR, max_loaded=int(os.environ.get("MODEL_CACHE_SIZE", "4")))
+    app.state.registry = registry
+    app.state.default_model = DEFAULT_MODEL if DEFAULT_MODEL in registry.model_files else registry.model_files[0]
+    # Load the default model before the first request arrives
+    registry[app.state.default_model]
+    app.state.pool = None
+    if INFERENCE_WORKERS > 0:
+        from inference_pool import InferencePool
+        # Fork before any batching threads exist
+        app.state.pool = InferencePool(registry, workers=INFERENCE_WORKERS)
+        app.state.batcher = MicroBatcher(
+            app.state.pool.classify_requests, max_batch_size=BATCH_MAX_SIZE,
+            max_wait_ms=BATCH_MAX_WAIT_MS, name="classify"
+        )
+    else:
+        app.state.batcher = make_classification_batcher(
+            registry, max_batch_size=BATCH_MAX_SIZE, max_wait_ms=BATCH_MAX_WAIT_MS
+        )
+    app.state.recorder = metrics.add_hook(metrics.HistogramRecorder())
+    logger.info("Service ready with default model %s", app.state.default_model)
+    try:
+        yield
+    finally:
+        app.state.batcher.close()
+        if app.state.pool is not None:
+            app.state.pool.close()
+        metrics.remove_hook(app.state.recorder)
+
+app = FastAPI(title="JOBI Match API", lifespan=lifespan)
+
+@app.middleware("http")
+async def record_latency(request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Route templates keep the tag set small; unmatched paths share one bucket
+        route = request.scope.get("route")
+        metrics.observe("http.request", time.perf_counter() - start,
+                        route=route.path if route is not None else "unmatched", status=status)
+
+def _resolve_model(model_name):
+    model_name = model_name or app.state.default_model
+    if model_name not in app.state.registry.model_files:
+        raise HTTPException(404, f"Unknown model {model_name}. Available: {', '.join(app.state.registry.model_files)}")
+    return model_name
+
+async def _classify(text, model_name, top_k):
+    model_name = _resolve_model(model_name)
+    # Batches run on the batcher's thread; the event loop only awaits the result
+    predicted_category, top_categories = await asyncio.wrap_future(
+        app.state.batcher.submit((text, model_name, top_k))
+    )
+    return ClassifyResponse(
+        model=model_name,
+        predicted_category=predicted_category,
+        confidence=top_categories[0][1],
+        top_categories=[CategoryScore(category=category, score=score) for category, score in top_categories],
+        chars=len(text),
+    )
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "models": app.state.registry.model_files, "default_model": app.state.default_model}
+
+@app.post("/classify", response_model=ClassifyResponse)
+async def classify_text(body: ClassifyRequest):
+    return await _classify(body.text, body.model, body.top_k)
+
+@app.post("/classify/pdf", response_model=ClassifyResponse)
+async def classify_pdf(request: Request, model: Optional[str] = None, top_k: int = Query(3, ge=1, le=25),
+                       max_pages: int = Query(DEFAULT_MAX_PAGES, ge=1)):
+    """Classify a PDF sent as the raw request body"""
+    data = await request.body()
+    if not data:
+        raise HTTPException(400, "Send the PDF as the request body")
+    if len(data) > MAX_PDF_BYTES:
+        raise HTTPException(413, f"PDF larger than {MAX_PDF_BYTES} bytes")
+    try:
+        text = await asyncio.to_thread(extract_resume_text, data, max_pages)
+    except Exception as e:
+        raise HTTPException(400, f"Error processing PDF: {e}")
+    if not text.strip():
+        raise HTTPException(422, "No text could be extracted from the PDF")
+    return await _classify(text, model, top_k)
+
+@app.post("/jobs/recommend")
+async def recommend_jobs(body: RecommendRequest):
+    """Recommend jobs for a category, or for a resume text (classified first when no category is given)"""
+    if not body.category and not body.text:
+        raise HTTPException(422, "Provide a resume text, a category or both")
+    category = body.category
+    if not category:
+        category = (await _classify(body.text, body.model, 1)).predicted_category
+
+    app_id, app_key = get_adzuna_credentials()
+    jobs, report = await asyncio.to_thread(find_jobs, category, body.location, body.num_jobs, app_id, app_key)
+
+    if body.text and jobs:
+        relevances = score_jobs_relevance(body.text, jobs)
+        jobs = [dict(job, relevance=float(relevance)) for job, relevance in zip(jobs, relevances)]
+        jobs.sort(key=lambda job: job["relevance"], reverse=True)
+    return {"category": category, "location": body.location, "jobs": jobs, "sources": report}
+
+@app.get("/metrics")
+async def get_metrics():
+    """Latency histograms and counters recorded by this worker process"""
+    return dict(app.state.recorder.snapshot(), pid=os.getpid())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve resume classification and job matching over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes, each with its own models")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    uvicorn.run("service:app", host=args.host, port=args.port, workers=args.workers)
+
+if __name__ == "__main__":
+    main()
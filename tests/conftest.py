@@ -0,0 +1,26 @@
+# conftest.py - Make the top-level modules importable when running pytest from anywhere
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+MODELS_DIR = os.path.join(REPO_DIR, "models")
+
+@pytest.fixture(scope="session")
+def registry():
+    """The shipped models, loaded lazily"""
+    from screening import load_model_registry
+    if not os.path.isdir(MODELS_DIR):
+        pytest.skip("models directory not available")
+    return load_model_registry(MODELS_DIR, max_loaded=16)
+
+@pytest.fixture(scope="session")
+def sample_texts(registry):
+    """Synthetic resumes from resume.py plus random draws from the TF-IDF vocabulary"""
+    import resume
+    from inference_pool import make_benchmark_texts
+    resumes = [row["Resume"] for row in resume.iter_resume_rows_sharded(150, seed=11, workers=1)]
+    return resumes + make_benchmark_texts(registry, 150, seed=11)
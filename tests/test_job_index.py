@@ -0,0 +1,51 @@
+# test_job_index.py - MaxScore top-k retrieval must return the exhaustive BM25 top k
+import random
+
+import pytest
+
+from job_index import JobIndex
+from text_normalizer import content_tokens, tokenize
+
+# Zipf-like word frequencies so some terms are common and others rare
+VOCABULARY = [f"term{i:03d}" for i in range(300)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+def random_text(rng, length):
+    return " ".join(rng.choices(VOCABULARY, weights=WEIGHTS, k=length))
+
+def exhaustive_scores(index, resume_text):
+    """BM25 score of every document, summing each distinct resume term's impact"""
+    index.build()
+    scores = [0.0] * len(index)
+    for term in set(content_tokens(tokenize(resume_text))):
+        for doc_id, impact in zip(*index.postings.get(term, ([], []))):
+            scores[doc_id] += impact
+    return scores
+
+@pytest.mark.parametrize("seed", range(40))
+def test_search_matches_exhaustive_bm25(seed):
+    rng = random.Random(seed)
+    index = JobIndex()
+    index.add_jobs(
+        {"title": random_text(rng, 3), "company": "", "description": random_text(rng, rng.randint(0, 60)),
+         "link": f"https://jobs.example/{i}"}
+        for i in range(rng.randint(1, 150))
+    )
+    resume_text = random_text(rng, rng.randint(1, 40))
+    k = rng.randint(1, 20)
+
+    results = index.search(resume_text, k=k)
+    scores = exhaustive_scores(index, resume_text)
+    doc_ids = {job["link"]: doc_id for doc_id, job in enumerate(index.jobs)}
+
+    # Every returned score is the document's exhaustive score
+    for job, score in results:
+        assert score == pytest.approx(scores[doc_ids[job["link"]]], rel=1e-9)
+    # ...and the returned scores are the k best, matched documents only
+    expected = sorted((score for score in scores if score > 0), reverse=True)[:k]
+    assert [score for _, score in results] == pytest.approx(expected, rel=1e-9)
+
+def test_search_without_matching_terms():
+    index = JobIndex()
+    index.add({"title": "term001", "company": "", "description": "", "link": "https://jobs.example/1"})
+    assert index.search("unrelated words", k=5) == []
@@ -0,0 +1,37 @@
+# test_jobsearch.py - Vectorized job scoring must agree with the per-listing scorer
+import random
+
+import numpy as np
+import pytest
+
+from jobsearch import score_job_relevance, score_jobs_relevance
+
+# Mixes short words (ignored by the ratio score), stop words and punctuation
+WORDS = [
+    "python", "java", "sql", "aws", "docker", "kubernetes", "react", "pandas", "spark", "data",
+    "engineer", "senior", "team", "cloud", "machine", "learning", "api", "the", "and", "with",
+    "C++", "node.js", "ml", "devops", "testing", "security", "design", "backend", "frontend",
+]
+
+def random_text(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+def random_job(rng):
+    return {
+        "title": random_text(rng, rng.randint(0, 4)),
+        "company": random_text(rng, rng.randint(0, 2)),
+        "description": random_text(rng, rng.randint(0, 40)),
+    }
+
+@pytest.mark.parametrize("seed", range(20))
+def test_ratio_mode_matches_score_job_relevance(seed):
+    rng = random.Random(seed)
+    resume_text = random_text(rng, rng.randint(0, 80))
+    jobs = [random_job(rng) for _ in range(rng.randint(1, 25))]
+
+    expected = [score_job_relevance(resume_text, job) for job in jobs]
+    # Equal up to floating-point summation order
+    np.testing.assert_allclose(score_jobs_relevance(resume_text, jobs), expected, rtol=1e-9, atol=1e-12)
+
+def test_no_listings():
+    assert score_jobs_relevance("python developer", []).shape == (0,)
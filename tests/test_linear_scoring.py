@@ -0,0 +1,24 @@
+# test_linear_scoring.py - Precompiled linear scoring must reproduce the sklearn estimators
+import numpy as np
+import pytest
+
+from linear_scoring import compile_linear_scorer
+from screening import adjust_feature_dimensions
+
+LINEAR_MODELS = ["linear_svm_model.pkl", "realistic_naive_bayes.pkl"]
+
+@pytest.mark.parametrize("model_name", LINEAR_MODELS)
+def test_scorer_matches_estimator(registry, sample_texts, model_name):
+    if model_name not in registry:
+        pytest.skip(f"{model_name} not shipped")
+    model = registry[model_name]
+    scorer = compile_linear_scorer(model)
+    assert scorer is not None
+
+    features = adjust_feature_dimensions(registry["tfidf_vectorizer.pkl"].transform(sample_texts), model.n_features_in_)
+    scores, decision = scorer.scores(features, return_decision=True)
+
+    expected = model.predict_proba(features) if scorer.is_probability else model.decision_function(features)
+    np.testing.assert_allclose(scores, expected, atol=1e-5)
+    # Saturating links tie classes in the probabilities; the decision argmax is still predict()
+    np.testing.assert_array_equal(model.classes_[decision.argmax(axis=1)], model.predict(features))
@@ -0,0 +1,20 @@
+# test_pdf_extract.py - Concurrent callers must share one extraction pool
+import threading
+
+import pdf_extract
+
+def test_concurrent_get_pool_creates_one_pool():
+    barrier = threading.Barrier(16)
+    pools = []
+
+    def get_pool():
+        barrier.wait()
+        pools.append(pdf_extract._get_pool(2))
+
+    threads = [threading.Thread(target=get_pool) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(pool) for pool in pools}) == 1
+    assert pdf_extract._pools[2] is pools[0]
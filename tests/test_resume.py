@@ -0,0 +1,66 @@
+# test_resume.py - Sharded synthetic resume generation must be reproducible
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import resume
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def sharded_rows(workers, **kwargs):
+    return list(resume.iter_resume_rows_sharded(60, seed=7, workers=workers, shard_size=20, **kwargs))
+
+def test_sharded_rows_independent_of_worker_count():
+    assert sharded_rows(1) == sharded_rows(3)
+
+class _NoClock(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        raise AssertionError("sharded generation read the wall clock")
+
+def test_sharded_rows_do_not_read_the_clock(monkeypatch):
+    monkeypatch.setattr(resume, "datetime", _NoClock)
+    rows = sharded_rows(1, as_of=datetime(2030, 6, 1))
+    assert len(rows) == 60
+
+def test_sharded_rows_independent_of_hash_seed():
+    # Set iteration order depends on PYTHONHASHSEED; the output must not
+    script = (
+        "import hashlib, resume; "
+        "rows = list(resume.iter_resume_rows_sharded(40, seed=7, workers=1, shard_size=20)); "
+        "print(hashlib.sha256(repr(rows).encode()).hexdigest())"
+    )
+    digests = set()
+    for hash_seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+        output = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", script], cwd=REPO_DIR, env=env,
+            capture_output=True, text=True, check=True
+        ).stdout
+        digests.add(output.strip().splitlines()[-1])
+    assert len(digests) == 1
+
+def test_plan_categories_is_seeded():
+    assert resume.plan_categories(500, seed=3) == resume.plan_categories(500, seed=3)
+    assert resume.plan_categories(500, seed=3) != resume.plan_categories(500, seed=4)
+
+def test_quotas_sum_to_total():
+    for num_resumes in (0, 1, len(resume.TECH_CATEGORIES) - 1, 1000, 1501):
+        quotas = resume.allocate_category_quotas(num_resumes)
+        assert sum(quotas.values()) == num_resumes
+        assert max(quotas.values()) - min(quotas.values()) <= 1
+
+def test_weighted_quotas_sum_to_total():
+    weights = resume.CATEGORY_WEIGHTS
+    for num_resumes in (7, 999, 10000):
+        quotas = resume.allocate_category_quotas(num_resumes, weights)
+        assert sum(quotas.values()) == num_resumes
+        # Largest remainder: every count is its exact share rounded down or up
+        for weight, quota in zip(weights, quotas.values()):
+            assert abs(quota - num_resumes * weight / sum(weights)) < 1
+
+def test_stratified_plan_has_exact_quotas():
+    plan = resume.plan_categories(1501, seed=5, balancing="stratified")
+    counts = {category: plan.count(category) for category in resume.TECH_CATEGORIES}
+    assert counts == resume.allocate_category_quotas(1501)
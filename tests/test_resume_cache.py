@@ -0,0 +1,21 @@
+# test_resume_cache.py - Cached text and results must not leak across page caps or model versions
+from resume_cache import ResumeCache
+
+def test_text_is_keyed_on_page_cap(tmp_path):
+    cache = ResumeCache(cache_dir=str(tmp_path))
+    cache.put_text("abc", 2, "first two pages")
+    assert cache.get_text("abc", 2) == "first two pages"
+    assert cache.get_text("abc", None) is None
+    assert cache.get_text("abc", 50) is None
+
+    # Also across processes sharing the directory
+    reopened = ResumeCache(cache_dir=str(tmp_path))
+    assert reopened.get_text("abc", 2) == "first two pages"
+    assert reopened.get_text("abc", None) is None
+
+def test_results_are_keyed_on_page_cap_and_model_version(tmp_path):
+    cache = ResumeCache(cache_dir=str(tmp_path))
+    cache.put_result("abc", 2, "model.pkl", "v1", ("Data Science", []))
+    assert cache.get_result("abc", 2, "model.pkl", "v1") == ("Data Science", [])
+    assert cache.get_result("abc", None, "model.pkl", "v1") is None
+    assert cache.get_result("abc", 2, "model.pkl", "v2") is None
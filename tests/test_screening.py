@@ -0,0 +1,40 @@
+# test_screening.py - The single scoring pass must predict the same label as model.predict
+import numpy as np
+
+from screening import adjust_feature_dimensions, classify_resume, classify_resumes, get_model_specs
+from text_normalizer import clean_text
+
+def predict_labels(registry, model_name, texts):
+    """Labels from the estimator's own predict(), with the same preprocessing classify_resumes applies"""
+    model = registry[model_name]
+    specs = get_model_specs(model_name, registry.model_info)
+    if specs['text_input'] == 'clean':
+        texts = [clean_text(text) for text in texts]
+    if specs.get('is_pipeline', False):
+        features = texts
+    else:
+        features = registry[specs.get('vectorizer', 'tfidf_vectorizer.pkl')].transform(texts)
+        features = adjust_feature_dimensions(features, specs.get('features'))
+    categories = registry['label_encoder'].classes_
+    return [p if isinstance(p, str) else categories[int(p)] for p in model.predict(features)]
+
+def test_every_model_label_matches_predict(registry, sample_texts):
+    for model_name in registry.model_files:
+        model = registry[model_name]
+        expected = predict_labels(registry, model_name, sample_texts)
+
+        results = classify_resumes(sample_texts, model, model_name, registry, registry.model_info)
+        assert [label for label, _ in results] == expected, model_name
+
+        for text, label in list(zip(sample_texts, expected))[::15]:
+            predicted_category, top_categories = classify_resume(text, model, model_name, registry, registry.model_info)
+            assert predicted_category == label == top_categories[0][0], model_name
+
+def test_top_categories_are_sorted(registry, sample_texts):
+    model_name = registry.model_files[0]
+    for _, top_categories in classify_resumes(sample_texts[:20], registry[model_name], model_name,
+                                              registry, registry.model_info, top_k=5):
+        scores = [score for _, score in top_categories]
+        assert len(top_categories) == 5
+        assert scores == sorted(scores, reverse=True)
+        assert np.all(np.isfinite(scores))
@@ -0,0 +1,21 @@
+# text_normalizer.py - Tokenization shared by classification and job scoring
+import re
+
+# A token is a maximal run of word characters; everything else separates tokens
+TOKEN_PATTERN = re.compile(r'\w+')
+
+STOP_WORDS = frozenset({'a', 'an', 'the', 'and', 'or', 'but', 'is', 'are', 'in', 'to', 'for', 'with', 'on', 'at', 'from', 'by'})
+
+def tokenize(text):
+    """Lowercase text and split it into word tokens, dropping punctuation and whitespace"""
+    if not isinstance(text, str):
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+def clean_text(text, tokens=None):
+    """Return lowercased text with punctuation removed and single spaces between words"""
+    return " ".join(tokenize(text) if tokens is None else tokens)
+
+def content_tokens(tokens):
+    """Drop stop words from a token list"""
+    return [token for token in tokens if token not in STOP_WORDS]